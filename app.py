@@ -1,32 +1,47 @@
 
-from flask import Flask, render_template, request, jsonify, flash, session, redirect, url_for
+from flask import Flask, render_template, request, jsonify, flash, session, redirect, url_for, Response, stream_with_context, send_from_directory
 import json
 import logging
 import os
+import secrets
+from contextlib import ExitStack
 import librosa
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib
-matplotlib.use('Agg')  # Use non-GUI backend
 import warnings
 warnings.filterwarnings("ignore")
 import joblib
 from sklearn.preprocessing import StandardScaler
-from news_verifier import NewsVerifier
+from news_verifier import NewsVerifier, parse_batch_headlines
 from config import Config
+from worker_pools import RoutePool, limit_concurrency
+from result_store import ResultStore
+from artifact_manager import ArtifactManager
+from spectrogram_pyramid import build_spectrogram_pyramid, render_tile
+from audio_features import AudioAnalysis, parse_feature_selection
+from voice_activity import detect_speech, keep_speech
+from plot_renderer import PlotRenderer, PLOT_KINDS, prepare_plot_data
+from request_profiler import RequestProfiler
+from werkzeug.utils import secure_filename
 
 app = Flask(__name__)
 app.config.from_object(Config)
 app.secret_key = 'your-secret-key-here'  # Add secret key for sessions
 
-# Audio upload configuration
-app.config['UPLOAD_FOLDER'] = 'uploads'
+# Audio upload configuration (UPLOAD_FOLDER comes from Config)
 app.config['STATIC_FOLDER'] = 'static'
 
 # Ensure directories exist
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 os.makedirs(app.config['STATIC_FOLDER'], exist_ok=True)
 
+# Uploads, generated plots and spectrogram pyramids are deleted by age and disk quota
+artifacts = ArtifactManager(
+    [app.config['UPLOAD_FOLDER'], Config.PLOT_FOLDER, Config.PYRAMID_FOLDER],
+    quota_bytes=Config.ARTIFACT_QUOTA_MB * 1024 * 1024,
+    ttl=Config.ARTIFACT_TTL_HOURS * 3600,
+    sweep_interval=Config.ARTIFACT_SWEEP_INTERVAL
+)
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -34,6 +49,30 @@ logger = logging.getLogger(__name__)
 # Initialize the news verifier
 news_verifier = NewsVerifier()
 
+# Audio analysis results, kept server-side and referenced by id
+result_store = ResultStore(
+    Config.RESULT_STORE_PATH,
+    max_entries=Config.RESULT_STORE_SIZE,
+    ttl=Config.RESULT_TTL_DAYS * 86400
+)
+
+# Plots render in parallel in a small per-worker process pool
+plot_renderer = PlotRenderer(Config.PLOT_WORKERS)
+
+# Opt-in sampling profiles of individual requests, listed at /admin/profiles
+profiler = RequestProfiler(
+    app,
+    directory=Config.PROFILE_DIR,
+    token=Config.PROFILE_TOKEN,
+    sample_rate=Config.PROFILE_SAMPLE_RATE,
+    max_files=Config.PROFILE_MAX_FILES,
+    interval=Config.PROFILE_INTERVAL_MS / 1000
+)
+
+# Separate concurrency limits so CPU-heavy audio analysis can't starve news verification
+audio_pool = RoutePool('audio', Config.AUDIO_POOL_SIZE, Config.AUDIO_POOL_QUEUE_TIMEOUT)
+news_pool = RoutePool('news', Config.NEWS_POOL_SIZE, Config.NEWS_POOL_QUEUE_TIMEOUT)
+
 # Load the trained MLP model
 try:
     mlp_model = joblib.load('rerec_MLP.pkl')
@@ -57,6 +96,10 @@ def extract_mlp_features(audio_path):
         # Load audio with duration limit to ensure consistent feature size
         y, sr = librosa.load(audio_path, duration=30)
         
+        # Only describe the voiced parts so silence doesn't skew the mean/std features
+        if Config.VAD_ENABLED:
+            y = keep_speech(y, detect_speech(y, sr))
+        
         # MFCC features (most important for deepfake detection)
         mfcc = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=13)
         mfcc_mean = np.mean(mfcc, axis=1)
@@ -114,16 +157,14 @@ def real_deepfake_detection(audio_path):
         # Fallback to mock detection if real detection fails
         return mock_deepfake_detection(audio_path)
 
-def mock_deepfake_detection(audio_path):
+def mock_deepfake_detection(audio_path, analysis=None):
     """
     Mock function for deepfake detection (fallback)
     """
-    # Simulate detection based on simple audio features
-    y, sr = librosa.load(audio_path)
-
-    # Extract some basic features for mock classification
-    spectral_centroid = np.mean(librosa.feature.spectral_centroid(y=y, sr=sr))
-    zero_crossing_rate = np.mean(librosa.feature.zero_crossing_rate(y))
+    # Simulate detection based on simple audio features, sharing work with feature extraction
+    analysis = analysis or AudioAnalysis(audio_path, trim_silence=Config.VAD_ENABLED)
+    spectral_centroid = analysis.get('spectral_centroid')
+    zero_crossing_rate = analysis.get('zero_crossing_rate')
 
     # Mock classification logic
     if spectral_centroid > 2000 or zero_crossing_rate > 0.1:
@@ -134,94 +175,51 @@ def mock_deepfake_detection(audio_path):
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in {'wav', 'mp3', 'flac', 'ogg', 'm4a'}
 
-def extract_audio_features(audio_path):
-    """Extract comprehensive audio features"""
-    y, sr = librosa.load(audio_path)
-
-    features = {
-        'duration': float(len(y) / sr),
-        'sample_rate': int(sr),
-        'rms_energy': float(np.mean(librosa.feature.rms(y=y))),
-        'spectral_centroid': float(np.mean(librosa.feature.spectral_centroid(y=y, sr=sr))),
-        'spectral_bandwidth': float(np.mean(librosa.feature.spectral_bandwidth(y=y, sr=sr))),
-        'zero_crossing_rate': float(np.mean(librosa.feature.zero_crossing_rate(y))),
-        'tempo': float(librosa.beat.tempo(y=y, sr=sr)[0])
-    }
-
-    return features
-
-def plot_waveform(audio_path, output_img):
-    """Generate waveform plot"""
-    y, sr = librosa.load(audio_path)
-
-    plt.figure(figsize=(12, 4))
-    plt.style.use('dark_background')
-    time = np.arange(len(y)) / sr
-    plt.plot(time, y, color='#00ffff', linewidth=0.5)
-    plt.title('Audio Waveform', fontsize=16, color='white')
-    plt.xlabel('Time (seconds)', fontsize=12, color='white')
-    plt.ylabel('Amplitude', fontsize=12, color='white')
-    plt.grid(True, alpha=0.3)
-    plt.tight_layout()
-    plt.savefig(output_img, dpi=150, bbox_inches='tight', facecolor='#1a1a2e')
-    plt.close()
-
-def plot_mfcc(audio_path, output_img):
-    """Generate MFCC heatmap"""
-    y, sr = librosa.load(audio_path)
-    mfccs = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=13)
-
-    plt.figure(figsize=(12, 6))
-    plt.style.use('dark_background')
-    librosa.display.specshow(mfccs, x_axis='time', sr=sr, cmap='plasma')
-    plt.colorbar(label='MFCC Coefficients')
-    plt.title('MFCC Features', fontsize=16, color='white')
-    plt.xlabel('Time (seconds)', fontsize=12, color='white')
-    plt.ylabel('MFCC Coefficients', fontsize=12, color='white')
-    plt.tight_layout()
-    plt.savefig(output_img, dpi=150, bbox_inches='tight', facecolor='#1a1a2e')
-    plt.close()
-
-def plot_spectrogram(audio_path, output_img):
-    """Generate spectrogram"""
-    y, sr = librosa.load(audio_path)
-    D = librosa.amplitude_to_db(np.abs(librosa.stft(y)), ref=np.max)
-
-    plt.figure(figsize=(12, 6))
-    plt.style.use('dark_background')
-    librosa.display.specshow(D, x_axis='time', y_axis='hz', sr=sr, cmap='magma')
-    plt.colorbar(label='Amplitude (dB)')
-    plt.title('Spectrogram', fontsize=16, color='white')
-    plt.xlabel('Time (seconds)', fontsize=12, color='white')
-    plt.ylabel('Frequency (Hz)', fontsize=12, color='white')
-    plt.tight_layout()
-    plt.savefig(output_img, dpi=150, bbox_inches='tight', facecolor='#1a1a2e')
-    plt.close()
-
-def plot_frequency_analysis(audio_path, output_img):
-    """Generate frequency domain analysis"""
-    y, sr = librosa.load(audio_path)
-
-    # Compute FFT
-    fft = np.fft.fft(y)
-    magnitude = np.abs(fft)
-    frequency = np.linspace(0, sr, len(magnitude))
-
-    # Plot only first half (positive frequencies)
-    left_frequency = frequency[:int(len(frequency)/2)]
-    left_magnitude = magnitude[:int(len(magnitude)/2)]
-
-    plt.figure(figsize=(12, 4))
-    plt.style.use('dark_background')
-    plt.plot(left_frequency, left_magnitude, color='#ff6b6b', linewidth=0.8)
-    plt.title('Frequency Domain Analysis', fontsize=16, color='white')
-    plt.xlabel('Frequency (Hz)', fontsize=12, color='white')
-    plt.ylabel('Magnitude', fontsize=12, color='white')
-    plt.xlim(0, 8000)  # Focus on human speech range
-    plt.grid(True, alpha=0.3)
-    plt.tight_layout()
-    plt.savefig(output_img, dpi=150, bbox_inches='tight', facecolor='#1a1a2e')
-    plt.close()
+def save_upload(file):
+    """Atomically save an uploaded file under a unique, safe name and return its path"""
+    name, ext = os.path.splitext(secure_filename(file.filename))
+    filepath = os.path.join(app.config['UPLOAD_FOLDER'], f"{name or 'audio'}_{secrets.token_hex(6)}{ext}")
+    with artifacts.atomic_path(filepath) as tmp_path:
+        file.save(tmp_path)
+    return filepath
+
+def extract_audio_features(audio_path, features=None, analysis=None):
+    """
+    Extract the selected audio features (all by default), computing only the
+    intermediates they need; pass an AudioAnalysis to share them with other stages
+    """
+    analysis = analysis or AudioAnalysis(audio_path, trim_silence=Config.VAD_ENABLED)
+    return analysis.compute(features if features is not None else parse_feature_selection(None))
+
+def plot_path(image):
+    """Location in PLOT_FOLDER of a plot referenced as <PLOT_SUBFOLDER>/<name> under static"""
+    return os.path.join(Config.PLOT_FOLDER, os.path.basename(image))
+
+def render_visualizations(analysis, base_name, kinds):
+    """Render the plots for an upload in parallel; returns {kind: path under static}"""
+    visualizations = {}
+    with ExitStack() as stack:
+        jobs = []
+        for kind in kinds:
+            image = f'{Config.PLOT_SUBFOLDER}/{kind}_{base_name}.png'
+            tmp_path = stack.enter_context(artifacts.atomic_path(plot_path(image)))
+            jobs.append((kind, prepare_plot_data(kind, analysis), tmp_path))
+            visualizations[kind] = image
+        plot_renderer.render(jobs)
+    return visualizations
+
+def save_spectrogram_pyramid(y, sr, pyramid_id):
+    """Precompute the tiled spectrogram pyramid; the .json is written last so it marks a complete pyramid"""
+    data, meta = build_spectrogram_pyramid(y, sr)
+
+    base_path = os.path.join(Config.PYRAMID_FOLDER, pyramid_id)
+    with artifacts.atomic_path(base_path + '.npy') as tmp_path:
+        np.save(tmp_path, data)
+    with artifacts.atomic_path(base_path + '.json') as tmp_path:
+        with open(tmp_path, 'w') as f:
+            json.dump(meta, f)
+
+    return meta
 
 # ==================== ROUTES ====================
 
@@ -231,7 +229,8 @@ def index():
     return render_template('index.html')
 
 @app.route('/verify', methods=['POST'])
-def verify_headline():
+@limit_concurrency(news_pool)
+async def verify_headline():
     """Verify the submitted news headline"""
     try:
         data = request.get_json() if request.is_json else request.form
@@ -243,9 +242,11 @@ def verify_headline():
                 'status': 'error'
             }), 400
         
+        archive_only = str(data.get('archive_only', '')).lower() in ('1', 'true', 'yes')
+        
         # Perform verification
         logger.info(f"Verifying headline: {headline}")
-        result = news_verifier.verify_headline(headline)
+        result = await news_verifier.averify_headline(headline, archive_only=archive_only)
         
         return jsonify({
             'status': 'success',
@@ -260,6 +261,74 @@ def verify_headline():
             'status': 'error'
         }), 500
 
+@app.route('/verify_stream')
+@limit_concurrency(news_pool)
+def verify_headline_stream():
+    """Verify a headline, streaming progress as Server-Sent Events"""
+    headline = request.args.get('headline', '').strip()
+    
+    if not headline:
+        return jsonify({
+            'error': 'Please provide a news headline to verify',
+            'status': 'error'
+        }), 400
+    
+    logger.info(f"Streaming verification for headline: {headline}")
+    
+    def generate():
+        for event in news_verifier.stream_verify_headline(headline):
+            yield f"event: {event['event']}\ndata: {json.dumps(event['data'])}\n\n"
+    
+    return Response(stream_with_context(generate()), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+@app.route('/verify_batch', methods=['POST'])
+@limit_concurrency(news_pool)
+def verify_headline_batch():
+    """Verify a batch of headlines, fetching each source once for the whole batch"""
+    try:
+        data = request.get_json(silent=True)
+        try:
+            headlines = parse_batch_headlines(data, Config.MAX_BATCH_HEADLINES)
+        except ValueError as e:
+            return jsonify({
+                'error': str(e),
+                'status': 'error'
+            }), 400
+        
+        logger.info(f"Verifying batch of {len(headlines)} headlines")
+        
+        # Stream one JSON object per line for large batches
+        stream = data.get('stream') or request.args.get('stream') == '1' \
+            or 'application/x-ndjson' in request.headers.get('Accept', '')
+        if stream:
+            def generate():
+                for result in news_verifier.iter_verify_headlines(headlines):
+                    yield json.dumps({
+                        'status': 'success',
+                        'headline': result['headline'],
+                        'verification_result': result
+                    }) + '\n'
+            
+            return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+        
+        results = news_verifier.verify_headlines(headlines)
+        
+        return jsonify({
+            'status': 'success',
+            'count': len(results),
+            'results': results
+        })
+        
+    except Exception as e:
+        logger.error(f"Error during batch verification: {str(e)}")
+        return jsonify({
+            'error': f'Batch verification failed: {str(e)}',
+            'status': 'error'
+        }), 500
+
 @app.route('/result')
 def show_result():
     """Display verification results"""
@@ -273,6 +342,7 @@ def audio_page():
     return render_template('audio.html')
 
 @app.route('/upload', methods=['POST'])
+@limit_concurrency(audio_pool)
 def upload_file():
     """Handle audio file upload and analysis"""
     if 'file' not in request.files:
@@ -282,52 +352,45 @@ def upload_file():
     if file.filename == '':
         return jsonify({'error': 'No file selected'}), 400
 
+    try:
+        selected_features = parse_feature_selection(request.form.get('features'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
     if file and allowed_file(file.filename):
         filename = file.filename
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(filepath)
+        filepath = save_upload(file)
 
         try:
-            # Extract audio features
-            features = extract_audio_features(filepath)
-
-            # Generate visualizations
-            base_name = os.path.splitext(filename)[0]
-            waveform_img = f'waveform_{base_name}.png'
-            mfcc_img = f'mfcc_{base_name}.png'
-            spectrogram_img = f'spectrogram_{base_name}.png'
-            frequency_img = f'frequency_{base_name}.png'
-            
-            # Full paths for saving
-            waveform_path = os.path.join('static', waveform_img)
-            mfcc_path = os.path.join('static', mfcc_img)
-            spectrogram_path = os.path.join('static', spectrogram_img)
-            frequency_path = os.path.join('static', frequency_img)
+            # Extract the requested audio features
+            analysis = AudioAnalysis(filepath, trim_silence=Config.VAD_ENABLED)
+            features = extract_audio_features(filepath, selected_features, analysis)
+
+            # Generate visualizations, named uniquely per upload
+            base_name = os.path.splitext(os.path.basename(filepath))[0]
+            kinds = [kind for kind in PLOT_KINDS
+                     if kind != 'spectrogram' or analysis.get('duration') <= Config.SPECTROGRAM_IMAGE_MAX_SECONDS]
+            visualizations = render_visualizations(analysis, base_name, kinds)
 
-            plot_waveform(filepath, waveform_path)
-            plot_mfcc(filepath, mfcc_path)
-            plot_spectrogram(filepath, spectrogram_path)
-            plot_frequency_analysis(filepath, frequency_path)
+            # Zoomable spectrogram, served tile by tile from /viz
+            save_spectrogram_pyramid(analysis.get('y_full'), analysis.get('sr'), base_name)
 
             # AI Detection (using mock function for now)
-            detection_result = mock_deepfake_detection(filepath)
+            detection_result = mock_deepfake_detection(filepath, analysis)
 
             result_data = {
                 'filename': filename,
                 'prediction': detection_result[0]['label'],
                 'confidence': f"{detection_result[0]['score'] * 100:.1f}%",
                 'features': features,
-                'visualizations': {
-                    'waveform': waveform_img,
-                    'mfcc': mfcc_img,
-                    'spectrogram': spectrogram_img,
-                    'frequency': frequency_img
-                }
+                'visualizations': visualizations,
+                'spectrogram_pyramid': base_name
             }
 
-            # Store result in session and redirect
-            session['audio_result'] = result_data
-            return redirect(url_for('audio_result'))
+            # Store result server-side and redirect to its shareable URL
+            result_id = result_store.put(result_data)
+            session['audio_result_id'] = result_id
+            return redirect(url_for('audio_result_by_id', result_id=result_id))
 
         except Exception as e:
             logger.error(f"Error processing audio: {str(e)}")
@@ -337,30 +400,107 @@ def upload_file():
 
 @app.route('/audio_result')
 def audio_result():
-    """Display audio analysis results"""
-    if 'audio_result' not in session:
+    """Display the most recent audio analysis results for this session"""
+    if 'audio_result_id' not in session:
         flash('No audio analysis results found. Please upload an audio file first.', 'warning')
         return redirect(url_for('audio_page'))
     
-    result_data = session['audio_result']
-    return render_template('audio_result.html', **result_data)
+    return redirect(url_for('audio_result_by_id', result_id=session['audio_result_id']))
+
+@app.route('/audio_result/<result_id>')
+def audio_result_by_id(result_id):
+    """Display stored audio analysis results"""
+    result_data = result_store.get(result_id)
+    if result_data is None:
+        flash('Audio analysis results not found or expired. Please upload the audio file again.', 'warning')
+        return redirect(url_for('audio_page'))
+    
+    # Plots and pyramids can be evicted for the disk quota while the result
+    # lives on; show only what is still on disk, and viewing keeps it there
+    visualizations = {kind: image for kind, image in result_data['visualizations'].items()
+                      if os.path.exists(plot_path(image))}
+    artifacts.touch(*(plot_path(image) for image in visualizations.values()))
+    pyramid = result_data.get('spectrogram_pyramid')
+    if pyramid:
+        pyramid_path = os.path.join(Config.PYRAMID_FOLDER, pyramid)
+        if os.path.exists(pyramid_path + '.json'):
+            artifacts.touch(pyramid_path + '.npy', pyramid_path + '.json')
+        else:
+            pyramid = None
+    if len(visualizations) < len(result_data['visualizations']):
+        logger.info(f"Result {result_id}: {len(result_data['visualizations']) - len(visualizations)} plots were evicted")
+    return render_template('audio_result.html', result_id=result_id,
+                           **dict(result_data, visualizations=visualizations, spectrogram_pyramid=pyramid))
+
+@app.route(f'/static/{Config.PLOT_SUBFOLDER}/<path:filename>')
+def plot_image(filename):
+    """Serve generated plots from PLOT_FOLDER, which need not live under static/"""
+    return send_from_directory(os.path.abspath(Config.PLOT_FOLDER), filename)
+
+def load_pyramid(result_id):
+    """Return (data path, meta) of a result's spectrogram pyramid, or None"""
+    result_data = result_store.get(result_id)
+    if not result_data or not result_data.get('spectrogram_pyramid'):
+        return None
+
+    base_path = os.path.join(Config.PYRAMID_FOLDER, result_data['spectrogram_pyramid'])
+    try:
+        with open(base_path + '.json') as f:
+            return base_path + '.npy', json.load(f)
+    except FileNotFoundError:
+        return None
+
+@app.route('/viz/<result_id>/spectrogram')
+def spectrogram_meta(result_id):
+    """Layout of a result's spectrogram pyramid for the tile viewer"""
+    pyramid = load_pyramid(result_id)
+    if pyramid is None:
+        return jsonify({'error': 'Spectrogram not found or expired'}), 404
+    return jsonify(pyramid[1])
+
+@app.route('/viz/<result_id>/spectrogram/<int:level>/<int:tile>')
+def spectrogram_tile(result_id, level, tile):
+    """One spectrogram tile as PNG; level 0 is the whole file, the last level full resolution"""
+    pyramid = load_pyramid(result_id)
+    if pyramid is None:
+        return jsonify({'error': 'Spectrogram not found or expired'}), 404
+
+    data_path, meta = pyramid
+    try:
+        png = render_tile(data_path, meta, level, tile)
+    except IndexError:
+        return jsonify({'error': 'Tile out of range'}), 404
+    except FileNotFoundError:
+        return jsonify({'error': 'Spectrogram not found or expired'}), 404
+
+    response = Response(png, mimetype='image/png')
+    # Tiles never change once computed
+    response.headers['Cache-Control'] = 'private, max-age=86400, immutable'
+    return response
 
 @app.route('/api/analyze', methods=['POST'])
+@limit_concurrency(audio_pool)
 def api_analyze():
     """API endpoint for audio analysis"""
     if 'file' not in request.files:
         return jsonify({'error': 'No file uploaded'}), 400
 
+    # features= selects what to compute; an empty selection returns only the prediction
+    try:
+        selected_features = parse_feature_selection(request.values.get('features'))
+    except ValueError as e:
+        return jsonify({'error': str(e), 'status': 'failed'}), 400
+
     file = request.files['file']
     if file and allowed_file(file.filename):
         filename = file.filename
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(filepath)
+        filepath = save_upload(file)
 
         try:
-            # Extract features and run detection
-            features = extract_audio_features(filepath)
-            detection_result = mock_deepfake_detection(filepath)
+            # Extract features and run detection, sharing intermediates
+            analysis = AudioAnalysis(filepath, trim_silence=Config.VAD_ENABLED)
+            features = extract_audio_features(filepath, selected_features, analysis)
+            detection_result = mock_deepfake_detection(filepath, analysis)
 
             return jsonify({
                 'filename': filename,
@@ -376,6 +516,50 @@ def api_analyze():
 
     return jsonify({'error': 'Invalid file format'}), 400
 
+@app.route('/api/pools')
+def pool_stats():
+    """In-flight and rejected request counts for each worker pool in this process"""
+    return jsonify({
+        'pid': os.getpid(),
+        'audio': audio_pool.stats(),
+        'news': news_pool.stats()
+    })
+
+@app.route('/api/feeds')
+def feed_stats():
+    """Health, circuit state and scheduling of each news feed in this process"""
+    return jsonify({
+        'pid': os.getpid(),
+        'sources': news_verifier.feed_scheduler.stats()
+    })
+
+@app.route('/admin/profiles')
+def list_profiles():
+    """Recent request profiles, newest first (requires the profiling token)"""
+    if not profiler.is_authorized():
+        return jsonify({'error': 'Unauthorized'}), 403
+    
+    profiles = profiler.list_profiles()
+    for profile in profiles:
+        profile['url'] = url_for('download_profile', profile_id=profile['id'])
+    return jsonify({'pid': os.getpid(), 'profiles': profiles})
+
+@app.route('/admin/profiles/<profile_id>')
+def download_profile(profile_id):
+    """A saved profile in speedscope format (open it at https://www.speedscope.app)"""
+    if not profiler.is_authorized():
+        return jsonify({'error': 'Unauthorized'}), 403
+    
+    path = profiler.profile_path(profile_id)
+    if path is None:
+        return jsonify({'error': 'Profile not found'}), 404
+    
+    with open(path, 'rb') as f:
+        data = f.read()
+    response = Response(data, mimetype='application/json')
+    response.headers['Content-Disposition'] = f'attachment; filename="{profile_id}.speedscope.json"'
+    return response
+
 @app.errorhandler(404)
 def not_found(error):
     return render_template('index.html'), 404
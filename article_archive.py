@@ -0,0 +1,209 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+import logging
+
+from sqlite_connections import ThreadLocalConnections
+
+
+class ArticleArchive:
+    """Persistent SQLite archive of seen articles with an FTS5 index over title and description"""
+
+    SCHEMA = '''
+        CREATE TABLE IF NOT EXISTS articles (
+            id INTEGER PRIMARY KEY,
+            url TEXT NOT NULL UNIQUE,
+            source TEXT,
+            title TEXT NOT NULL,
+            description TEXT,
+            published_at TEXT,
+            seen_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_articles_seen_at ON articles(seen_at);
+        CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+            title, description, content='articles', content_rowid='id'
+        );
+        CREATE TRIGGER IF NOT EXISTS articles_ai AFTER INSERT ON articles BEGIN
+            INSERT INTO articles_fts(rowid, title, description)
+            VALUES (new.id, new.title, new.description);
+        END;
+        CREATE TRIGGER IF NOT EXISTS articles_ad AFTER DELETE ON articles BEGIN
+            INSERT INTO articles_fts(articles_fts, rowid, title, description)
+            VALUES ('delete', old.id, old.title, old.description);
+        END;
+        CREATE TRIGGER IF NOT EXISTS articles_au AFTER UPDATE OF title, description ON articles BEGIN
+            INSERT INTO articles_fts(articles_fts, rowid, title, description)
+            VALUES ('delete', old.id, old.title, old.description);
+            INSERT INTO articles_fts(rowid, title, description)
+            VALUES (new.id, new.title, new.description);
+        END;
+        CREATE TABLE IF NOT EXISTS archive_meta (key TEXT PRIMARY KEY, value REAL NOT NULL);
+        INSERT OR IGNORE INTO archive_meta (key, value) VALUES ('last_compact', 0);
+    '''
+
+    def __init__(self, path, retention_days=30, compact_interval=3600, max_term_docs=1000, max_ranked=5000,
+                 compact_batch=1000, merge_pages=500):
+        self.path = path
+        self.retention_days = retention_days
+        self.compact_interval = compact_interval
+        self.compact_batch = compact_batch  # expired rows deleted per write transaction
+        self.merge_pages = merge_pages  # FTS pages merged per compaction, bounding its write
+        self.max_term_docs = max_term_docs  # words in more articles than this are too common to search by
+        self.max_ranked = max_ranked  # most articles ranked with bm25 per search
+        self.logger = logging.getLogger(__name__)
+        self._connections = ThreadLocalConnections(path, row_factory=sqlite3.Row)
+        self._compact_lock = threading.Lock()
+        self._compactor_lock = threading.Lock()
+        self._compactor_pid = None
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._connections.get().executescript(self.SCHEMA)
+
+    def add_articles(self, articles):
+        """
+        Bulk insert articles, deduplicating by URL.
+        Each article is a dict with url, source, title, description and published_at.
+        """
+        now = time.time()
+        rows = [
+            (a['url'], a.get('source'), a['title'], a.get('description') or '', a.get('published_at') or '', now)
+            for a in articles if a.get('url') and a.get('title')
+        ]
+        if not rows:
+            return 0
+
+        conn = self._connections.get()
+        with conn:
+            conn.executemany('''
+                INSERT INTO articles (url, source, title, description, published_at, seen_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET seen_at = excluded.seen_at
+            ''', rows)
+
+        self._ensure_compactor()
+        return len(rows)
+
+    def _document_frequency(self, conn, term):
+        """Number of articles containing term, counted up to max_term_docs + 1"""
+        return conn.execute(
+            'SELECT count(*) FROM (SELECT 1 FROM articles_fts WHERE articles_fts MATCH ? LIMIT ?)',
+            (f'"{term}"', self.max_term_docs + 1)
+        ).fetchone()[0]
+
+    def search(self, text, limit=50):
+        """
+        Return archived articles matching words of the text, best first.
+
+        Ranking every article that shares any word with the text is too slow
+        over millions of rows, so candidates are restricted before ranking:
+        the rarest words (each in at most max_term_docs articles, together
+        in at most max_ranked) are OR-ed and ranked with bm25. If every word
+        is common, the newest articles containing the first three are
+        returned. Words are taken in text order when equally frequent, so
+        callers should put the most important words first.
+        """
+        terms = list(dict.fromkeys(word for word in re.findall(r'\w+', text.lower()) if len(word) > 2))
+        if not terms:
+            return []
+
+        conn = self._connections.get()
+        frequencies = {term: self._document_frequency(conn, term) for term in terms}
+        # sorted() is stable, so ties keep their order in the text
+        terms = sorted((term for term in terms if frequencies[term]), key=frequencies.get)
+
+        rare = []
+        ranked = 0
+        for term in terms:
+            if frequencies[term] > self.max_term_docs or ranked + frequencies[term] > self.max_ranked:
+                break
+            rare.append(term)
+            ranked += frequencies[term]
+
+        # Quote each term so FTS5 operators in user input are treated literally
+        if rare:
+            match, order = ' OR '.join(f'"{term}"' for term in rare), 'bm25(articles_fts)'
+        elif terms:
+            # Intersecting more than a few very common words costs as much as ranking them all
+            match, order = ' AND '.join(f'"{term}"' for term in terms[:3]), 'articles_fts.rowid DESC'
+        else:
+            return []
+
+        rows = conn.execute(f'''
+            SELECT a.url, a.source, a.title, a.description, a.published_at
+            FROM articles_fts
+            JOIN articles a ON a.id = articles_fts.rowid
+            WHERE articles_fts MATCH ?
+            ORDER BY {order}
+            LIMIT ?
+        ''', (match, limit)).fetchall()
+
+        return [dict(row) for row in rows]
+
+    def compact(self):
+        """
+        Drop articles older than the retention window and merge FTS index
+        segments. Rows are deleted in batches of compact_batch, each in its
+        own transaction, so writers adding articles only wait for one batch.
+        """
+        if not self._compact_lock.acquire(blocking=False):
+            return 0
+
+        try:
+            cutoff = time.time() - self.retention_days * 86400
+            conn = self._connections.get()
+            deleted = 0
+            while True:
+                with conn:
+                    batch = conn.execute(
+                        'DELETE FROM articles WHERE id IN (SELECT id FROM articles WHERE seen_at < ? LIMIT ?)',
+                        (cutoff, self.compact_batch)
+                    ).rowcount
+                deleted += batch
+                if batch < self.compact_batch:
+                    break
+
+            # An incremental merge rather than 'optimize', which rewrites the whole index in one transaction
+            with conn:
+                conn.execute("INSERT INTO articles_fts(articles_fts, rank) VALUES ('merge', ?)", (self.merge_pages,))
+
+            self.logger.info(f"Article archive compacted, removed {deleted} expired articles")
+            return deleted
+        finally:
+            self._compact_lock.release()
+
+    def _claim_compaction(self):
+        """Whether this process should compact now; at most one process per interval wins the claim"""
+        now = time.time()
+        conn = self._connections.get()
+        with conn:
+            return conn.execute(
+                "UPDATE archive_meta SET value = ? WHERE key = 'last_compact' AND value <= ?",
+                (now, now - self.compact_interval)
+            ).rowcount == 1
+
+    def _ensure_compactor(self):
+        """Start the compaction thread in this process (threads don't survive fork)"""
+        if self._compactor_pid == os.getpid():
+            return
+        with self._compactor_lock:
+            if self._compactor_pid == os.getpid():
+                return
+            self._compactor_pid = os.getpid()
+            threading.Thread(target=self._run_compactor, name='archive-compactor', daemon=True).start()
+
+    def _run_compactor(self):
+        # Every process runs one, but the shared claim elects a single one per interval
+        while True:
+            time.sleep(self.compact_interval)
+            try:
+                if self._claim_compaction():
+                    self.compact()
+            except Exception as e:
+                self.logger.error(f"Article archive compaction failed: {str(e)}")
+
+    def count(self):
+        """Number of archived articles"""
+        return self._connections.get().execute('SELECT COUNT(*) FROM articles').fetchone()[0]
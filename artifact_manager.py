@@ -0,0 +1,154 @@
+import os
+import secrets
+import threading
+import time
+import logging
+from contextlib import contextmanager
+
+
+class ArtifactManager:
+    """
+    Lifecycle management for uploads and generated plots.
+
+    Every file under the managed directories counts against a byte quota.
+    A file's mtime is its last access time (touch() bumps it), so all
+    workers share the same view of what is least recently used. A
+    background sweeper deletes files idle for longer than the TTL and
+    evicts least recently used files while the quota is exceeded.
+    """
+
+    def __init__(self, directories, quota_bytes, ttl, sweep_interval=300, min_age=900):
+        self.directories = list(directories)
+        self.quota_bytes = quota_bytes
+        self.ttl = ttl  # seconds since last access before a file expires
+        self.sweep_interval = sweep_interval
+        self.min_age = min_age  # never evict files touched this recently (likely in use)
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._sweeper_pid = None
+        self._pending_bytes = 0
+
+        for directory in self.directories:
+            os.makedirs(directory, exist_ok=True)
+
+    @contextmanager
+    def atomic_path(self, path):
+        """
+        Yield a temporary path next to path; on success it is atomically
+        renamed into place and registered, so readers never see partial files.
+        """
+        directory, name = os.path.split(path)
+        root, ext = os.path.splitext(name)
+        # Keep the extension so writers like savefig infer the right format
+        tmp_path = os.path.join(directory, f'.{root}.{secrets.token_hex(4)}.tmp{ext}')
+        try:
+            yield tmp_path
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        self.register(path)
+
+    def register(self, path):
+        """Account for a newly written file, waking the sweeper if over quota"""
+        self._ensure_sweeper()
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return
+
+        with self._lock:
+            self._pending_bytes += size
+            pending = self._pending_bytes
+        if pending > self.quota_bytes // 10:
+            self._wake.set()
+
+    def touch(self, *paths):
+        """Mark files as recently used"""
+        self._ensure_sweeper()
+        for path in paths:
+            try:
+                os.utime(path, None)
+            except OSError:
+                pass
+
+    def _scan(self):
+        """Return [(last_access, size, path)] for every managed file, including atomic_path temporaries"""
+        files = []
+        for directory in self.directories:
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_file(follow_symlinks=False):
+                            st = entry.stat(follow_symlinks=False)
+                            files.append((st.st_mtime, st.st_size, entry.path))
+            except FileNotFoundError:
+                continue
+        return files
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+            return True
+        except FileNotFoundError:
+            return False
+        except OSError as e:
+            self.logger.warning(f"Failed to delete artifact {path}: {str(e)}")
+            return False
+
+    def sweep(self):
+        """Delete expired files, then least recently used files until under quota"""
+        now = time.time()
+        files = []
+        removed = 0
+        for last_access, size, path in self._scan():
+            if os.path.basename(path).startswith('.'):
+                # atomic_path temporary; if a writer crashed nothing renames or removes it
+                if now - last_access > self.min_age and self._remove(path):
+                    removed += 1
+                continue
+            files.append((last_access, size, path))
+
+        files.sort()
+        total = sum(size for _, size, _ in files)
+        freed = 0
+
+        for last_access, size, path in files:
+            expired = now - last_access > self.ttl
+            over_quota = total - freed > self.quota_bytes and now - last_access > self.min_age
+            if not expired and not over_quota:
+                # Sorted oldest first, so no newer file qualifies either
+                break
+            if self._remove(path):
+                removed += 1
+                freed += size
+
+        with self._lock:
+            self._pending_bytes = 0
+
+        if removed:
+            self.logger.info(f"Artifact sweep removed {removed} files ({freed} bytes), {total - freed} bytes in use")
+        return removed
+
+    def _ensure_sweeper(self):
+        """Start the sweeper thread in this process (threads don't survive fork)"""
+        if self._sweeper_pid == os.getpid():
+            return
+        with self._lock:
+            if self._sweeper_pid == os.getpid():
+                return
+            self._sweeper_pid = os.getpid()
+            threading.Thread(target=self._run_sweeper, name='artifact-sweeper', daemon=True).start()
+
+    def _run_sweeper(self):
+        while True:
+            self._wake.wait(self.sweep_interval)
+            self._wake.clear()
+            try:
+                self.sweep()
+            except Exception as e:
+                self.logger.error(f"Artifact sweep failed: {str(e)}")
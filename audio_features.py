@@ -0,0 +1,194 @@
+import numpy as np
+import librosa
+
+from voice_activity import detect_speech, keep_speech, speech_duration
+
+# name -> (dependencies, function of the dependency values)
+_registry = {}
+
+# Selectable features in report order; everything else is an intermediate
+FEATURES = []
+
+# Features computed when the caller doesn't choose
+DEFAULT_FEATURES = []
+
+
+def register(name, *dependencies, output=False, default=True):
+    """Register a feature or intermediate computed from the named dependencies"""
+    def decorator(fn):
+        _registry[name] = (dependencies, fn)
+        if output:
+            FEATURES.append(name)
+            if default:
+                DEFAULT_FEATURES.append(name)
+        return fn
+    return decorator
+
+
+def parse_feature_selection(value):
+    """
+    Parse a features= request value. None selects the default features,
+    'all' every feature, '' or 'none' nothing (prediction only), otherwise
+    a comma-separated list of names. Raises ValueError for unknown names.
+    """
+    if value is None:
+        return list(DEFAULT_FEATURES)
+    if value.strip().lower() == 'all':
+        return list(FEATURES)
+    if value.strip().lower() in ('', 'none'):
+        return []
+
+    names = [name.strip() for name in value.split(',') if name.strip()]
+    unknown = [name for name in names if name not in FEATURES]
+    if unknown:
+        raise ValueError(f"Unknown features: {', '.join(unknown)}. Available: {', '.join(FEATURES)}")
+    return list(dict.fromkeys(names))
+
+
+class AudioAnalysis:
+    """
+    Computes registered features of one audio file on demand.
+
+    Requested names are resolved through their declared dependencies and
+    every intermediate (signal, STFT, mel spectrogram, ...) is computed at
+    most once, so callers sharing an AudioAnalysis share that work.
+
+    With trim_silence, 'y' holds only the voiced parts of the file and all
+    signal features are computed over speech; 'y_full' is always the whole file.
+    """
+
+    def __init__(self, audio_path=None, y=None, sr=None, trim_silence=False):
+        self._values = {'audio_path': audio_path, 'trim_silence': trim_silence}
+        if y is not None:
+            self._values.update(y_full=y, sr=sr)
+
+    def plan(self, names):
+        """Return the not-yet-computed nodes needed for names, dependencies first"""
+        order = []
+        visiting = set()
+
+        def visit(name):
+            if name in self._values or name in order:
+                return
+            if name not in _registry:
+                raise KeyError(f"Unknown audio feature: {name}")
+            if name in visiting:
+                raise ValueError(f"Circular feature dependency at {name}")
+            visiting.add(name)
+            for dependency in _registry[name][0]:
+                visit(dependency)
+            visiting.discard(name)
+            order.append(name)
+
+        for name in names:
+            visit(name)
+        return order
+
+    def get(self, name):
+        for node in self.plan([name]):
+            dependencies, fn = _registry[node]
+            self._values[node] = fn(*(self._values[d] for d in dependencies))
+        return self._values[name]
+
+    def compute(self, names):
+        """Return {name: value} for the requested names"""
+        return {name: self.get(name) for name in names}
+
+
+# ==================== INTERMEDIATES ====================
+
+@register('signal', 'audio_path')
+def _signal(audio_path):
+    return librosa.load(audio_path)
+
+
+@register('y_full', 'signal')
+def _y_full(signal):
+    return signal[0]
+
+
+@register('sr', 'signal')
+def _sr(signal):
+    return signal[1]
+
+
+@register('speech_intervals', 'y_full', 'sr')
+def _speech_intervals(y_full, sr):
+    return detect_speech(y_full, sr)
+
+
+@register('y', 'y_full', 'speech_intervals', 'trim_silence')
+def _y(y_full, speech_intervals, trim_silence):
+    return keep_speech(y_full, speech_intervals) if trim_silence else y_full
+
+
+@register('stft_magnitude', 'y')
+def _stft_magnitude(y):
+    return np.abs(librosa.stft(y))
+
+
+@register('mel', 'stft_magnitude', 'sr')
+def _mel(stft_magnitude, sr):
+    return librosa.feature.melspectrogram(S=stft_magnitude ** 2, sr=sr)
+
+
+@register('mel_db', 'mel')
+def _mel_db(mel):
+    return librosa.power_to_db(mel)
+
+
+@register('mfcc', 'mel_db')
+def _mfcc(mel_db):
+    return librosa.feature.mfcc(S=mel_db, n_mfcc=13)
+
+
+@register('onset_envelope', 'mel_db', 'sr')
+def _onset_envelope(mel_db, sr):
+    return librosa.onset.onset_strength(S=mel_db, sr=sr)
+
+
+# ==================== FEATURES ====================
+
+@register('duration', 'y_full', 'sr', output=True)
+def _duration(y_full, sr):
+    return float(len(y_full) / sr)
+
+
+@register('speech_duration', 'speech_intervals', 'sr', output=True, default=False)
+def _speech_duration(speech_intervals, sr):
+    return speech_duration(speech_intervals, sr)
+
+
+@register('speech_ratio', 'speech_duration', 'duration', output=True, default=False)
+def _speech_ratio(speech_duration, duration):
+    return speech_duration / duration if duration else 0.0
+
+
+@register('sample_rate', 'sr', output=True)
+def _sample_rate(sr):
+    return int(sr)
+
+
+@register('rms_energy', 'y', output=True)
+def _rms_energy(y):
+    return float(np.mean(librosa.feature.rms(y=y)))
+
+
+@register('spectral_centroid', 'stft_magnitude', 'sr', output=True)
+def _spectral_centroid(stft_magnitude, sr):
+    return float(np.mean(librosa.feature.spectral_centroid(S=stft_magnitude, sr=sr)))
+
+
+@register('spectral_bandwidth', 'stft_magnitude', 'sr', output=True)
+def _spectral_bandwidth(stft_magnitude, sr):
+    return float(np.mean(librosa.feature.spectral_bandwidth(S=stft_magnitude, sr=sr)))
+
+
+@register('zero_crossing_rate', 'y', output=True)
+def _zero_crossing_rate(y):
+    return float(np.mean(librosa.feature.zero_crossing_rate(y)))
+
+
+@register('tempo', 'onset_envelope', 'sr', output=True)
+def _tempo(onset_envelope, sr):
+    return float(librosa.feature.tempo(onset_envelope=onset_envelope, sr=sr)[0])
@@ -10,6 +10,7 @@ class Config:
     
     # News API configurations
     NEWS_API_KEY = os.environ.get('NEWS_API_KEY') or '8b335dc6442443eca479b1bf193cfc68'
+    NEWS_API_URL = os.environ.get('NEWS_API_URL') or None  # Override the NewsAPI base URL, e.g. for load testing
     
     # Google Fact Check API (optional - free tier available)
     GOOGLE_API_KEY = os.environ.get('GOOGLE_API_KEY') or None
@@ -17,15 +18,104 @@ class Config:
     # Rate limiting
     REQUESTS_PER_MINUTE = 60
     
+    # Gunicorn worker processes (gunicorn.conf.py always sets it)
+    WEB_CONCURRENCY = int(os.environ.get('WEB_CONCURRENCY') or max(2, os.cpu_count() or 2))
+    
+    # Per-process request pools; requests wait up to the queue timeout for a
+    # free slot before getting a 503. Audio analysis is CPU-bound, so its limit
+    # is for the whole server: with WEB_CONCURRENCY set, AUDIO_CONCURRENCY
+    # analyses are split across the workers (at least one each), while a
+    # single process (python app.py, the load test) gets all of them
+    AUDIO_CONCURRENCY = int(os.environ.get('AUDIO_CONCURRENCY') or os.cpu_count() or 2)
+    AUDIO_POOL_SIZE = int(
+        os.environ.get('AUDIO_POOL_SIZE')
+        or (max(1, AUDIO_CONCURRENCY // WEB_CONCURRENCY) if os.environ.get('WEB_CONCURRENCY') else AUDIO_CONCURRENCY)
+    )
+    AUDIO_POOL_QUEUE_TIMEOUT = 10  # seconds
+    NEWS_POOL_SIZE = int(os.environ.get('NEWS_POOL_SIZE') or 64)
+    NEWS_POOL_QUEUE_TIMEOUT = 5  # seconds
+    
+    # Asynchronous news server (news_service.py): verifications in flight and
+    # open outbound connections per process, all on one event loop
+    NEWS_SERVICE_POOL_SIZE = int(os.environ.get('NEWS_SERVICE_POOL_SIZE') or 500)
+    NEWS_SERVICE_CONNECTION_LIMIT = int(os.environ.get('NEWS_SERVICE_CONNECTION_LIMIT') or 500)
+    
+    # Warm up librosa's JIT-compiled features in wsgi.py before gunicorn forks
+    PRELOAD_WARMUP = os.environ.get('PRELOAD_WARMUP', '1') == '1'
+    
     # Verification settings
     SIMILARITY_THRESHOLD = 0.7  # Threshold for headline similarity
     MIN_SOURCES = 2  # Minimum sources required for verification
+    MAX_BATCH_HEADLINES = 500  # Maximum headlines accepted by /verify_batch
+    BATCH_FACT_CHECK_CONCURRENCY = 8  # Fact-check searches (each querying every site) in flight per batch
     
     # Timeout settings
     REQUEST_TIMEOUT = 30  # seconds
+    FEED_TIMEOUT = 10  # seconds per RSS feed download
+    ASYNC_CONNECTION_LIMIT = 100  # Open connections per verification in the async pipeline
+    
+    # Feed health: consecutive failures open a source's circuit for a cooldown
+    # (doubling per trip); parsed feeds are reused for a refresh interval that
+    # is shortest for the sources that produce the most matches
+    FEED_FAILURE_THRESHOLD = 3
+    FEED_CIRCUIT_COOLDOWN = 60  # seconds
+    FEED_CIRCUIT_MAX_COOLDOWN = 1800
+    FEED_REFRESH_MIN_SECONDS = int(os.environ.get('FEED_REFRESH_MIN_SECONDS') or 60)
+    FEED_REFRESH_MAX_SECONDS = int(os.environ.get('FEED_REFRESH_MAX_SECONDS') or 600)
+    
+    # Local article archive (SQLite FTS5) for historical verification
+    ARCHIVE_ENABLED = os.environ.get('ARCHIVE_ENABLED', '1') == '1'
+    ARCHIVE_PATH = os.environ.get('ARCHIVE_PATH') or 'article_archive.db'
+    ARCHIVE_RETENTION_DAYS = 90
+    ARCHIVE_COMPACT_INTERVAL = 3600  # seconds between retention compactions
+    ARCHIVE_CANDIDATE_LIMIT = 50  # Candidates retrieved per headline
+    
+    # Server-side store for audio analysis results (SQLite lets any worker serve them)
+    RESULT_STORE_PATH = os.environ.get('RESULT_STORE_PATH', 'result_store.db') or None
+    RESULT_STORE_SIZE = 1000  # Results cached in memory per process
+    RESULT_TTL_DAYS = 7
+    
+    # Uploaded audio, generated plots and spectrogram pyramids share a disk quota;
+    # least recently viewed files are evicted first and idle files expire
+    UPLOAD_FOLDER = os.environ.get('UPLOAD_FOLDER') or 'uploads'
+    PLOT_SUBFOLDER = 'generated'  # plots are served under /static/<PLOT_SUBFOLDER>/
+    PLOT_FOLDER = os.environ.get('PLOT_FOLDER') or os.path.join('static', PLOT_SUBFOLDER)
+    ARTIFACT_QUOTA_MB = int(os.environ.get('ARTIFACT_QUOTA_MB') or 1024)
+    ARTIFACT_TTL_HOURS = int(os.environ.get('ARTIFACT_TTL_HOURS') or 24 * 7)
+    ARTIFACT_SWEEP_INTERVAL = 300  # seconds between background sweeps
+    
+    # Tiled spectrogram pyramids, served by /viz; the static spectrogram
+    # image is only rendered for clips up to this length
+    PYRAMID_FOLDER = os.environ.get('PYRAMID_FOLDER') or 'pyramids'
+    SPECTROGRAM_IMAGE_MAX_SECONDS = 120
+    
+    # Extract audio features and run detection over voiced frames only
+    # (speech_duration and speech_ratio can be requested with features=)
+    VAD_ENABLED = os.environ.get('VAD_ENABLED', '1') == '1'
+    
+    # Processes rendering plots for each app worker (0 renders in the request thread)
+    PLOT_WORKERS = int(os.environ.get('PLOT_WORKERS') or 2)
+    
+    # Request profiling: callers sending PROFILE_TOKEN in the X-Profile-Token
+    # header can profile a request with X-Profile: 1 (or ?profile=1), and
+    # PROFILE_SAMPLE_RATE of all requests are profiled at random; only the
+    # newest PROFILE_MAX_FILES profiles are kept
+    PROFILE_DIR = os.environ.get('PROFILE_DIR') or 'profiles'
+    PROFILE_TOKEN = os.environ.get('PROFILE_TOKEN') or None
+    PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE') or 0)
+    PROFILE_MAX_FILES = 200
+    PROFILE_INTERVAL_MS = 5  # stack sampling interval
+    
+    # Use the streaming RSS parser instead of feedparser for the verification hot path
+    FAST_FEED_PARSER = True
+    
+    # Word lists (stop words, priority terms, places, months) for keyword and location extraction
+    GAZETTEER_DIR = os.environ.get('GAZETTEER_DIR') or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'gazetteer')
     
     # News sources for scraping (backup when API limits reached)
-    NEWS_SOURCES = [
+    # NEWS_SOURCES in the environment (comma-separated) replaces the list below
+    NEWS_SOURCES = [url.strip() for url in os.environ['NEWS_SOURCES'].split(',') if url.strip()] \
+        if os.environ.get('NEWS_SOURCES') else [
         # International sources
         'https://feeds.bbci.co.uk/news/rss.xml',
         'https://rss.cnn.com/rss/edition.rss',
@@ -45,6 +135,9 @@ class Config:
         'https://www.deccanherald.com/rss.xml',  # Deccan Herald
     ]
     
+    # Search URL used to look for fact-checks; {site} and {terms} are filled in
+    FACT_CHECK_SEARCH_URL = os.environ.get('FACT_CHECK_SEARCH_URL') or 'https://www.google.com/search?q=site:{site} {terms}'
+    
     # Fact-checking sources
     FACT_CHECK_SOURCES = [
         # International fact-checking sites
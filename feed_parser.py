@@ -0,0 +1,141 @@
+import io
+import re
+import html
+import logging
+import xml.etree.ElementTree as ET
+import feedparser
+
+logger = logging.getLogger(__name__)
+
+# Local element names (namespace stripped) for the fields we keep
+ITEM_TAGS = {'item', 'entry'}
+FEED_TAGS = {'channel', 'feed'}
+PUBLISHED_TAGS = ('pubDate', 'published', 'updated', 'date')
+SUMMARY_TAGS = ('description', 'summary', 'content', 'encoded')
+
+# Namespaces whose elements are read as entry fields; extensions such as
+# media:content and media:title reuse the local names with another meaning
+FIELD_NAMESPACES = {
+    '',  # RSS 0.9x / 2.0
+    'http://www.w3.org/2005/Atom',
+    'http://purl.org/atom/ns#',  # Atom 0.3
+    'http://purl.org/rss/1.0/',
+    'http://purl.org/rss/1.0/modules/content/',  # content:encoded
+    'http://purl.org/dc/elements/1.1/',  # dc:date
+}
+
+TAG_RE = re.compile(r'<[^>]+>')
+
+# Root element -> feedparser-style version; any other root is not a feed
+ROOT_VERSIONS = {'rss': 'rss', 'feed': 'atom', 'RDF': 'rss10'}
+
+
+class FeedEntry:
+    """Compact feed entry exposing the feedparser attributes used by the verifier"""
+    __slots__ = ('title', 'link', 'published', 'summary')
+
+    def __init__(self, title='', link='', published='', summary=''):
+        self.title = title
+        self.link = link
+        self.published = published
+        self.summary = summary
+
+    def get(self, key, default=None):
+        value = getattr(self, key, None) if key in self.__slots__ else None
+        return value if value else default
+
+
+class ParsedFeed:
+    """Minimal feedparser-compatible result: feed.feed.get('title') and feed.entries"""
+    __slots__ = ('feed', 'entries', 'bozo', 'version')
+
+    def __init__(self, title=None, entries=None, version=''):
+        self.feed = {'title': title} if title else {}
+        self.entries = entries or []
+        self.bozo = False
+        self.version = version
+
+
+def _local_name(tag):
+    return tag.rsplit('}', 1)[-1] if isinstance(tag, str) else ''
+
+
+def _namespace(tag):
+    return tag[1:].split('}', 1)[0] if isinstance(tag, str) and tag.startswith('{') else ''
+
+
+def _text(elem):
+    """Element text with HTML entities and markup removed"""
+    text = ''.join(elem.itertext()).strip()
+    if '<' in text or '&' in text:
+        # Unescape first: escaped HTML (Atom type="html") only becomes markup here
+        text = TAG_RE.sub('', html.unescape(text)).strip()
+    return text
+
+
+def parse_feed(content):
+    """
+    Parse RSS 2.0, RSS 1.0 or Atom bytes incrementally, keeping only the
+    feed title and each entry's title, link, published date and summary.
+    Elements are cleared as soon as they are consumed to bound memory.
+    Raises ET.ParseError on malformed input.
+    """
+    feed_title = None
+    entries = []
+    stack = []
+    root_name = None
+    fields = None
+
+    for event, elem in ET.iterparse(io.BytesIO(content), events=('start', 'end')):
+        name = _local_name(elem.tag)
+
+        if event == 'start':
+            if root_name is None:
+                root_name = name
+            stack.append(elem)
+            if name in ITEM_TAGS:
+                fields = {}
+            continue
+
+        stack.pop()
+        parent = stack[-1] if stack else None
+        parent_name = _local_name(parent.tag) if parent is not None else ''
+
+        if fields is not None and name in ITEM_TAGS:
+            summary = next((fields[t] for t in SUMMARY_TAGS if fields.get(t)), '')
+            published = next((fields[t] for t in PUBLISHED_TAGS if fields.get(t)), '')
+            if fields.get('title'):
+                entries.append(FeedEntry(fields['title'], fields.get('link', ''), published, summary))
+            fields = None
+        elif fields is not None and parent_name in ITEM_TAGS:
+            if name == 'link':
+                # Atom links carry the URL in href; keep the first alternate link
+                href = elem.get('href')
+                if 'link' not in fields and (href or elem.text) and elem.get('rel', 'alternate') == 'alternate':
+                    fields['link'] = (href or elem.text).strip()
+            elif name not in fields and _namespace(elem.tag) in FIELD_NAMESPACES \
+                    and (name == 'title' or name in PUBLISHED_TAGS or name in SUMMARY_TAGS):
+                fields[name] = _text(elem)
+            continue
+        elif name == 'title' and feed_title is None and parent_name in FEED_TAGS \
+                and _namespace(elem.tag) in FIELD_NAMESPACES:
+            feed_title = _text(elem)
+        elif fields is not None:
+            # Nested element inside an entry field; the field element handles it
+            continue
+
+        # Drop consumed elements from the tree as we go
+        elem.clear()
+        if parent is not None:
+            parent.remove(elem)
+
+    return ParsedFeed(feed_title, entries, ROOT_VERSIONS.get(root_name, ''))
+
+
+def parse_feed_content(content, feed_url=''):
+    """Parse downloaded feed bytes, falling back to feedparser on malformed XML"""
+    try:
+        return parse_feed(content)
+    except ET.ParseError as e:
+        logger.info(f"Falling back to feedparser for {feed_url}: {str(e)}")
+        return feedparser.parse(content)
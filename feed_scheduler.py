@@ -0,0 +1,186 @@
+import time
+import threading
+import logging
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class SourceHealth:
+    """Rolling health of one feed; averages are exponentially weighted"""
+
+    __slots__ = ('url', 'state', 'fetches', 'failures', 'consecutive_failures', 'trips',
+                 'latency', 'error_rate', 'entries', 'match_yield', 'scored',
+                 'opened_at', 'probe_started_at', 'last_error', 'last_success',
+                 'feed', 'fetched_at')
+
+    def __init__(self, url):
+        self.url = url
+        self.state = CLOSED
+        self.fetches = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.trips = 0  # consecutive times the circuit opened without recovering
+        self.latency = None
+        self.error_rate = 0.0
+        self.entries = None
+        self.match_yield = None  # average matches per headline scored against this feed
+        self.scored = 0
+        self.opened_at = None
+        self.probe_started_at = None
+        self.last_error = None
+        self.last_success = None
+        self.feed = None  # last good parsed feed
+        self.fetched_at = None
+
+
+def _ewma(average, value, alpha):
+    return value if average is None else average + alpha * (value - average)
+
+
+class FeedScheduler:
+    """
+    Per-source feed health, circuit breaking and refresh scheduling.
+
+    Each source tracks latency, error rate, entry count and match yield.
+    After failure_threshold consecutive failures its circuit opens and the
+    source is skipped; once the cooldown (doubling with every trip up to
+    max_cooldown) has passed, one request probes it (half-open) and a
+    success closes the circuit again. Sources are returned highest yield
+    first, and a good parse is reused for a refresh interval that ranges
+    from min_refresh for the highest-yield sources to max_refresh for
+    sources that never match, so useful feeds are fetched more often.
+    State is per process.
+    """
+
+    def __init__(self, failure_threshold=3, cooldown=60, max_cooldown=1800,
+                 min_refresh=60, max_refresh=600, probe_timeout=30, alpha=0.2):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.min_refresh = min_refresh
+        self.max_refresh = max_refresh
+        self.probe_timeout = probe_timeout  # seconds before an unanswered probe is retried
+        self.alpha = alpha
+        self.logger = logging.getLogger(__name__)
+        self._sources = {}
+        self._lock = threading.Lock()
+
+    def _source(self, url):
+        source = self._sources.get(url)
+        if source is None:
+            source = self._sources[url] = SourceHealth(url)
+        return source
+
+    def _cooldown(self, source):
+        return min(self.cooldown * 2 ** max(source.trips - 1, 0), self.max_cooldown)
+
+    def _refresh_interval(self, source, best_yield):
+        if not best_yield or source.match_yield is None:
+            return self.min_refresh
+        share = min(source.match_yield / best_yield, 1.0)
+        return self.max_refresh - (self.max_refresh - self.min_refresh) * share
+
+    def _priority(self, source):
+        # Unmeasured sources first so they get measured, then by yield and speed
+        return (source.match_yield is not None, -(source.match_yield or 0), source.latency or 0)
+
+    def plan(self, urls):
+        """
+        Decide which feeds this request uses, highest priority first.
+        Returns [(url, feed)] where feed is a cached parse still fresh
+        enough to reuse, or None if the URL should be downloaded now.
+        Sources with an open circuit are left out.
+        """
+        now = time.time()
+        planned = []
+
+        with self._lock:
+            sources = [self._source(url) for url in dict.fromkeys(urls)]
+            best_yield = max((s.match_yield or 0 for s in sources), default=0)
+
+            for source in sorted(sources, key=self._priority):
+                if source.state == OPEN:
+                    if now - source.opened_at < self._cooldown(source):
+                        continue
+                    source.state = HALF_OPEN
+                    source.probe_started_at = now
+                    self.logger.info(f"Probing feed {source.url} after {self._cooldown(source):.0f}s open circuit")
+                    planned.append((source.url, None))
+                elif source.state == HALF_OPEN:
+                    # One probe at a time, unless it was lost (e.g. a cancelled request)
+                    if now - source.probe_started_at > self.probe_timeout:
+                        source.probe_started_at = now
+                        planned.append((source.url, None))
+                elif source.feed is not None and now - source.fetched_at < self._refresh_interval(source, best_yield):
+                    planned.append((source.url, source.feed))
+                else:
+                    planned.append((source.url, None))
+
+        return planned
+
+    def record_success(self, url, latency, feed):
+        with self._lock:
+            source = self._source(url)
+            source.fetches += 1
+            source.consecutive_failures = 0
+            source.latency = _ewma(source.latency, latency, self.alpha)
+            source.error_rate = _ewma(source.error_rate, 0.0, self.alpha)
+            source.entries = _ewma(source.entries, len(feed.entries), self.alpha)
+            source.last_success = time.time()
+            source.feed = feed
+            source.fetched_at = source.last_success
+            if source.state != CLOSED:
+                self.logger.info(f"Feed {url} recovered, closing circuit")
+            source.state = CLOSED
+            source.trips = 0
+
+    def record_failure(self, url, latency, error):
+        with self._lock:
+            source = self._source(url)
+            source.fetches += 1
+            source.failures += 1
+            source.consecutive_failures += 1
+            source.latency = _ewma(source.latency, latency, self.alpha)
+            source.error_rate = _ewma(source.error_rate, 1.0, self.alpha)
+            source.last_error = str(error)
+
+            # Fetches that started before the circuit opened don't extend it
+            if source.state == HALF_OPEN or (source.state == CLOSED and
+                                             source.consecutive_failures >= self.failure_threshold):
+                source.state = OPEN
+                source.opened_at = time.time()
+                source.trips += 1
+                self.logger.warning(f"Feed {url} circuit open for {self._cooldown(source):.0f}s "
+                                    f"after {source.consecutive_failures} failures: {str(error)}")
+
+    def record_matches(self, url, matches, headlines=1):
+        """Account for how many matches a feed produced for a number of headlines"""
+        with self._lock:
+            source = self._source(url)
+            source.scored += headlines
+            source.match_yield = _ewma(source.match_yield, matches / headlines, self.alpha)
+
+    def stats(self):
+        now = time.time()
+        with self._lock:
+            best_yield = max((s.match_yield or 0 for s in self._sources.values()), default=0)
+            sources = sorted(self._sources.values(), key=self._priority)
+            return [{
+                'url': s.url,
+                'state': s.state,
+                'fetches': s.fetches,
+                'failures': s.failures,
+                'consecutive_failures': s.consecutive_failures,
+                'error_rate': round(s.error_rate, 3),
+                'avg_latency_ms': round(s.latency * 1000, 1) if s.latency is not None else None,
+                'avg_entries': round(s.entries, 1) if s.entries is not None else None,
+                'match_yield': round(s.match_yield, 3) if s.match_yield is not None else None,
+                'headlines_scored': s.scored,
+                'refresh_interval_s': round(self._refresh_interval(s, best_yield)),
+                'cooldown_remaining_s': round(max(self._cooldown(s) - (now - s.opened_at), 0))
+                                        if s.state == OPEN else 0,
+                'last_success_age_s': round(now - s.last_success) if s.last_success else None,
+                'last_error': s.last_error
+            } for s in sources]
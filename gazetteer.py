@@ -0,0 +1,189 @@
+import os
+import re
+from collections import deque
+from functools import lru_cache
+
+TOKEN_RE = re.compile(r'\w+')
+PERSON_TOKEN_RE = re.compile(r'[A-Z][a-z]+')
+DAY_GAP_RE = re.compile(r'\s+')
+YEAR_GAP_RE = re.compile(r',?\s+')
+
+DEFAULT_DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'gazetteer')
+
+# Data file name -> kind of entry it holds
+DATA_FILES = {
+    'stop_words.txt': 'stop',
+    'priority_terms.txt': 'priority',
+    'places_india.txt': 'place_india',
+    'places_international.txt': 'place_international',
+    'months.txt': 'month',
+}
+
+PLACE_KINDS = {'place_india', 'place_international'}
+LOCATION_SUFFIXES = {'city', 'state', 'country', 'street', 'avenue', 'road'}
+
+
+class ScanResult:
+    """Everything the gazetteer found in one pass over a text"""
+
+    def __init__(self):
+        self.tokens = []  # lowercased tokens in order
+        self.stop = []  # per-token: token is a stop word
+        self.priority = []  # per-token: token is a priority term or part of a place
+        self.places = []  # [{'name', 'kind', 'text'}] in order of appearance
+        self.dates = []
+        self.persons = []
+        self.locations = []
+
+
+class Gazetteer:
+    """
+    Word-level Aho-Corasick automaton over stop words, priority terms,
+    place names and months. Scanning is linear in the number of tokens
+    regardless of how many entries are loaded.
+    """
+
+    def __init__(self):
+        self._goto = [{}]  # state -> {word: next state}
+        self._fail = [0]
+        self._out = [[]]  # state -> [(length in tokens, kinds)] of entries ending here
+        self._kinds = [set()]
+        self._built = False
+
+    @classmethod
+    def from_directory(cls, data_dir=DEFAULT_DATA_DIR):
+        """Load every known data file present in data_dir"""
+        gazetteer = cls()
+        for filename, kind in DATA_FILES.items():
+            path = os.path.join(data_dir, filename)
+            if os.path.exists(path):
+                gazetteer.load_file(path, kind)
+        gazetteer.build()
+        return gazetteer
+
+    def load_file(self, path, kind):
+        """Add one entry per non-comment line of a data file"""
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith('#'):
+                    self.add(line, kind)
+
+    def add(self, phrase, kind):
+        """Add a phrase of the given kind to the automaton"""
+        words = TOKEN_RE.findall(phrase.lower())
+        if not words:
+            return
+
+        state = 0
+        for word in words:
+            nxt = self._goto[state].get(word)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][word] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._kinds.append(set())
+            state = nxt
+
+        self._kinds[state].add(kind)
+        self._built = False
+
+    def build(self):
+        """Compute failure links and merged outputs breadth-first"""
+        self._out = [[] for _ in self._goto]
+        depth = [0] * len(self._goto)
+        queue = deque()
+
+        for state in self._goto[0].values():
+            self._fail[state] = 0
+            depth[state] = 1
+            queue.append(state)
+
+        while queue:
+            state = queue.popleft()
+            if self._kinds[state]:
+                self._out[state].append((depth[state], frozenset(self._kinds[state])))
+            # Inherit the outputs of the longest proper suffix
+            self._out[state].extend(self._out[self._fail[state]])
+
+            for word, nxt in self._goto[state].items():
+                depth[nxt] = depth[state] + 1
+                f = self._fail[state]
+                while f and word not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(word, 0)
+                queue.append(nxt)
+
+        self._built = True
+
+    def scan(self, text):
+        """Tokenize text once and report stop words, priority terms, places, dates, persons and locations"""
+        if not self._built:
+            self.build()
+
+        result = ScanResult()
+        tokens = result.tokens
+        spans = []
+        state = 0
+        person_open = False
+        month_at = None
+
+        for match in TOKEN_RE.finditer(text):
+            raw = match.group()
+            word = raw.lower()
+            i = len(tokens)
+            tokens.append(word)
+            result.stop.append(False)
+            result.priority.append(False)
+            spans.append(match.span())
+            joined = i > 0 and DAY_GAP_RE.fullmatch(text[spans[i - 1][1]:spans[i][0]])
+
+            # Person names: two adjacent capitalized words, non-overlapping
+            if (joined and not person_open and PERSON_TOKEN_RE.fullmatch(raw)
+                    and PERSON_TOKEN_RE.fullmatch(text[spans[i - 1][0]:spans[i - 1][1]])):
+                result.persons.append(text[spans[i - 1][0]:spans[i][1]])
+                person_open = True
+            else:
+                person_open = False
+
+            # "<word> City", "<word> Road" and similar location phrases
+            if joined and word in LOCATION_SUFFIXES:
+                result.locations.append(text[spans[i - 1][0]:spans[i][1]])
+
+            while state and word not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(word, 0)
+
+            for length, kinds in self._out[state]:
+                first = i - length + 1
+
+                if 'stop' in kinds and length == 1:
+                    result.stop[i] = True
+                if 'priority' in kinds or kinds & PLACE_KINDS:
+                    for j in range(first, i + 1):
+                        result.priority[j] = True
+                for kind in kinds & PLACE_KINDS:
+                    result.places.append({
+                        'name': ' '.join(tokens[first:i + 1]),
+                        'kind': kind,
+                        'text': text[spans[first][0]:spans[i][1]]
+                    })
+                if 'month' in kinds:
+                    month_at = i
+
+            # Dates: "<Month> <day>, <year>" completed at the year token
+            if month_at is not None and i == month_at + 2:
+                day = tokens[month_at + 1]
+                if (day.isdigit() and len(day) <= 2 and word.isdigit() and len(word) == 4
+                        and DAY_GAP_RE.fullmatch(text[spans[month_at][1]:spans[month_at + 1][0]])
+                        and YEAR_GAP_RE.fullmatch(text[spans[month_at + 1][1]:spans[i][0]])):
+                    result.dates.append(text[spans[month_at][0]:spans[i][1]])
+
+        return result
+
+
+@lru_cache(maxsize=None)
+def get_gazetteer(data_dir=DEFAULT_DATA_DIR):
+    """Shared gazetteer, loaded once per process"""
+    return Gazetteer.from_directory(data_dir)
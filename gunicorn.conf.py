@@ -0,0 +1,49 @@
+"""
+Gunicorn settings for production.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+The app (model, librosa, matplotlib) is preloaded in the master and frozen
+out of the garbage collector before forking, so workers share it
+copy-on-write. Each worker runs a thread pool large enough for both
+request pools in worker_pools (audio and news); the pools, not the
+thread count, bound how many requests of each kind run at once. The
+audio pools together allow AUDIO_CONCURRENCY analyses server-wide.
+"""
+import gc
+import os
+
+# Set before Config is read so it splits AUDIO_CONCURRENCY across the workers
+os.environ.setdefault('WEB_CONCURRENCY', str(max(2, os.cpu_count() or 2)))
+
+from config import Config
+
+bind = os.environ.get('BIND') or f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = Config.WEB_CONCURRENCY
+worker_class = 'gthread'
+# One thread per pool slot plus a few for pages, static files and /api/pools
+threads = Config.AUDIO_POOL_SIZE + Config.NEWS_POOL_SIZE + 4
+
+preload_app = True
+timeout = int(os.environ.get('GUNICORN_TIMEOUT') or 120)
+graceful_timeout = 30
+keepalive = 5
+
+# Recycle workers periodically to bound memory growth from long-lived plotting state
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS') or 1000)
+max_requests_jitter = 100
+
+accesslog = '-'
+errorlog = '-'
+
+
+def when_ready(server):
+    # Move everything loaded so far out of GC tracking so collections in
+    # workers don't touch (and copy) the shared pages
+    gc.freeze()
+    server.log.info(f"Preloaded app frozen for copy-on-write sharing ({gc.get_freeze_count()} objects)")
+
+
+def post_fork(server, worker):
+    server.log.info(f"Worker {worker.pid} started with {threads} threads "
+                    f"(audio pool {Config.AUDIO_POOL_SIZE}, news pool {Config.NEWS_POOL_SIZE})")
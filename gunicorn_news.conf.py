@@ -0,0 +1,30 @@
+"""
+Gunicorn settings for the asynchronous news server.
+
+    gunicorn -c gunicorn_news.conf.py news_service:app
+
+Each worker runs one aiohttp event loop that holds up to
+NEWS_SERVICE_POOL_SIZE verifications in flight, so a couple of workers
+cover what would otherwise take hundreds of WSGI threads. Put it behind
+the same proxy as gunicorn.conf.py and send /verify, /verify_stream,
+/verify_batch and /api/feeds here.
+"""
+import os
+
+from config import Config
+
+bind = os.environ.get('NEWS_BIND') or f"0.0.0.0:{os.environ.get('NEWS_PORT', '8001')}"
+workers = int(os.environ.get('NEWS_WORKERS') or 2)
+worker_class = 'aiohttp.GunicornWebWorker'
+
+timeout = int(os.environ.get('GUNICORN_TIMEOUT') or 120)
+graceful_timeout = 30
+keepalive = 5
+
+accesslog = '-'
+errorlog = '-'
+
+
+def post_fork(server, worker):
+    server.log.info(f"News worker {worker.pid} started "
+                    f"(pool {Config.NEWS_SERVICE_POOL_SIZE}, connections {Config.NEWS_SERVICE_CONNECTION_LIMIT})")
@@ -0,0 +1,138 @@
+"""
+Offline load test for /verify and /upload.
+
+Starts a stub news server replaying recorded RSS, NewsAPI and fact-check
+responses, points the app at it through environment config, then drives
+the app at each concurrency level and reports throughput, latency
+percentiles and error rates.
+
+    python -m loadtest --concurrency 1,8,32 --duration 30 --scenario mixed
+
+The in-process app runs on werkzeug's development server, which is fine
+for comparing changes but not for capacity numbers. For those, drive the
+production servers with --target (gunicorn.conf.py) and --news-target
+(news_service behind gunicorn_news.conf.py, which then takes the /verify
+requests); start them with the environment printed by --stubs-only so
+they talk to the stubs.
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import logging
+
+from loadtest.stub_servers import StubNewsServer, StubBehaviour, FIXTURES_DIR
+from loadtest.load_generator import LoadGenerator
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m loadtest', description='Offline load test for /verify and /upload')
+    parser.add_argument('--target', help='Base URL of a running app; by default the app is started in-process')
+    parser.add_argument('--news-target', help='Base URL of a running news_service for /verify (default: --target)')
+    parser.add_argument('--scenario', choices=('verify', 'upload', 'mixed'), default='verify')
+    parser.add_argument('--concurrency', default='1,4,16', help='Comma-separated concurrency levels')
+    parser.add_argument('--duration', type=float, default=30.0, help='Seconds per concurrency level')
+    parser.add_argument('--audio', default=os.path.join(FIXTURES_DIR, 'sample.mp3'), help='Audio file for /upload')
+    parser.add_argument('--headlines', default=os.path.join(FIXTURES_DIR, 'headlines.txt'))
+    parser.add_argument('--latency', type=float, default=0.05, help='Mean stub response latency, seconds')
+    parser.add_argument('--jitter', type=float, default=0.02, help='Uniform +/- jitter on stub latency, seconds')
+    parser.add_argument('--failure-rate', type=float, default=0.0, help='Fraction of stub responses that are HTTP 503')
+    parser.add_argument('--hang-rate', type=float, default=0.0, help='Fraction of stub responses that stall')
+    parser.add_argument('--hang-seconds', type=float, default=30.0)
+    parser.add_argument('--stubs-only', action='store_true', help='Only run the stub server and print its config')
+    parser.add_argument('--json', dest='json_path', help='Write the full report to this file')
+    return parser.parse_args(argv)
+
+
+def start_app_in_process(env):
+    """Import the app with stub config and serve it on an ephemeral port"""
+    os.environ.update(env)
+    # Keep recorded articles, uploads, plots and results out of the real ones
+    work_dir = tempfile.mkdtemp(prefix='loadtest-')
+    os.environ.setdefault('ARCHIVE_PATH', os.path.join(work_dir, 'articles.db'))
+    os.environ.setdefault('RESULT_STORE_PATH', os.path.join(work_dir, 'results.db'))
+    os.environ.setdefault('UPLOAD_FOLDER', os.path.join(work_dir, 'uploads'))
+    os.environ.setdefault('PLOT_FOLDER', os.path.join(work_dir, 'plots'))
+    os.environ.setdefault('PYRAMID_FOLDER', os.path.join(work_dir, 'pyramids'))
+    sys.path.insert(0, ROOT_DIR)
+    os.chdir(ROOT_DIR)
+
+    from werkzeug.serving import make_server
+    from app import app
+
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, name='loadtest-app', daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_port}', work_dir
+
+
+def print_report(report):
+    print(f"\nconcurrency={report['concurrency']} duration={report['duration_s']}s")
+    print(f"{'endpoint':<10} {'reqs':>7} {'rps':>8} {'err%':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    rows = list(report['endpoints'].items()) + [('all', report['overall'])]
+    for name, stats in rows:
+        print(f"{name:<10} {stats['requests']:>7} {stats['throughput_rps']:>8} {stats['error_rate'] * 100:>6.2f}% "
+              f"{stats['p50_ms']:>9} {stats['p95_ms']:>9} {stats['p99_ms']:>9}")
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+
+    behaviour = StubBehaviour(args.latency, args.jitter, args.failure_rate, args.hang_rate, args.hang_seconds)
+    stubs = StubNewsServer(behaviours={kind: behaviour for kind in ('rss', 'newsapi', 'factcheck')}).start()
+    env = stubs.config_env()
+
+    if args.stubs_only:
+        print('Stub news server running. Start the app with:')
+        for key, value in env.items():
+            print(f"  export {key}='{value}'")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
+        stubs.stop()
+        return 0
+
+    app_server = work_dir = None
+    target = args.target
+    if not target:
+        app_server, target, work_dir = start_app_in_process(env)
+
+    with open(args.headlines, encoding='utf-8') as f:
+        headlines = [line.strip() for line in f if line.strip()]
+
+    generator = LoadGenerator(
+        target, headlines,
+        audio_path=args.audio if args.scenario != 'verify' else None,
+        scenario=args.scenario,
+        news_target=args.news_target
+    )
+
+    reports = []
+    try:
+        for level in [int(c) for c in args.concurrency.split(',') if c.strip()]:
+            report = generator.run(level, args.duration)
+            reports.append(report)
+            print_report(report)
+    finally:
+        if app_server:
+            app_server.shutdown()
+            shutil.rmtree(work_dir, ignore_errors=True)
+        stubs.stop()
+
+    print(f"\nStub requests served: {stubs.request_counts}")
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump({'scenario': args.scenario, 'target': target, 'news_target': generator.news_target,
+                       'levels': reports}, f, indent=2)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
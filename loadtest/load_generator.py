@@ -0,0 +1,111 @@
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100.0 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class LoadGenerator:
+    """Drive /verify and /upload at a fixed concurrency and collect latency statistics"""
+
+    def __init__(self, target, headlines, audio_path=None, scenario='verify', timeout=120, news_target=None):
+        self.target = target.rstrip('/')
+        self.news_target = (news_target or target).rstrip('/')  # where /verify goes
+        self.headlines = headlines
+        self.audio_path = audio_path
+        self.scenario = scenario  # 'verify', 'upload' or 'mixed'
+        self.timeout = timeout
+        self._local = threading.local()
+
+        if scenario in ('upload', 'mixed') and not audio_path:
+            raise ValueError('An audio file is required for the upload scenario')
+        self.audio_bytes = None
+        if audio_path:
+            with open(audio_path, 'rb') as f:
+                self.audio_bytes = f.read()
+
+    def _session(self):
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+
+    def _request(self, endpoint):
+        """Issue one request, returning (endpoint, latency seconds, ok)"""
+        start = time.perf_counter()
+        try:
+            if endpoint == '/verify':
+                response = self._session().post(
+                    self.news_target + endpoint,
+                    json={'headline': random.choice(self.headlines)},
+                    timeout=self.timeout
+                )
+            else:
+                response = self._session().post(
+                    self.target + endpoint,
+                    files={'file': (os.path.basename(self.audio_path), self.audio_bytes)},
+                    allow_redirects=False,
+                    timeout=self.timeout
+                )
+            ok = response.status_code < 400
+        except requests.RequestException:
+            ok = False
+        return endpoint, time.perf_counter() - start, ok
+
+    def _pick_endpoint(self):
+        if self.scenario == 'mixed':
+            return random.choice(('/verify', '/upload'))
+        return '/upload' if self.scenario == 'upload' else '/verify'
+
+    def run(self, concurrency, duration):
+        """Run closed-loop workers for duration seconds and return a report dict"""
+        samples = []
+        lock = threading.Lock()
+        deadline = time.perf_counter() + duration
+
+        def worker():
+            while time.perf_counter() < deadline:
+                sample = self._request(self._pick_endpoint())
+                with lock:
+                    samples.append(sample)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = [executor.submit(worker) for _ in range(concurrency)]
+        elapsed = time.perf_counter() - started
+        # Re-raise anything that killed a worker instead of reporting a quietly smaller sample
+        for future in futures:
+            future.result()
+
+        return self.report(concurrency, elapsed, samples)
+
+    def report(self, concurrency, elapsed, samples):
+        """Summarise samples overall and per endpoint"""
+        def summarise(subset):
+            latencies = sorted(latency for _, latency, _ in subset)
+            errors = sum(1 for _, _, ok in subset if not ok)
+            return {
+                'requests': len(subset),
+                'throughput_rps': round(len(subset) / elapsed, 2) if elapsed else 0.0,
+                'error_rate': round(errors / len(subset), 4) if subset else 0.0,
+                'p50_ms': round(percentile(latencies, 50) * 1000, 1),
+                'p95_ms': round(percentile(latencies, 95) * 1000, 1),
+                'p99_ms': round(percentile(latencies, 99) * 1000, 1),
+            }
+
+        endpoints = sorted({endpoint for endpoint, _, _ in samples})
+        return {
+            'concurrency': concurrency,
+            'duration_s': round(elapsed, 2),
+            'overall': summarise(samples),
+            'endpoints': {e: summarise([s for s in samples if s[0] == e]) for e in endpoints},
+        }
@@ -0,0 +1,133 @@
+import os
+import random
+import threading
+import time
+import logging
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+class StubBehaviour:
+    """Latency and failure injection for one kind of stub endpoint"""
+
+    def __init__(self, latency=0.0, jitter=0.0, failure_rate=0.0, hang_rate=0.0, hang_seconds=30.0):
+        self.latency = latency  # mean delay before responding, seconds
+        self.jitter = jitter  # +/- uniform jitter around latency, seconds
+        self.failure_rate = failure_rate  # fraction of requests answered with HTTP 503
+        self.hang_rate = hang_rate  # fraction of requests that stall for hang_seconds
+        self.hang_seconds = hang_seconds
+
+    def delay(self):
+        return max(0.0, self.latency + random.uniform(-self.jitter, self.jitter))
+
+
+class _StubHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Concurrent verifications open dozens of connections at once
+    request_queue_size = 1024
+
+
+class StubNewsServer:
+    """
+    Local HTTP server replaying recorded RSS feeds, NewsAPI responses and
+    fact-check search pages.
+
+    Routes:
+        /rss/<name>.xml   recorded feed from fixtures/rss
+        /v2/everything    recorded NewsAPI response (fixtures/newsapi.json)
+        /search           recorded fact-check search page (fixtures/factcheck.html)
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, fixtures_dir=FIXTURES_DIR, behaviours=None):
+        self.fixtures_dir = fixtures_dir
+        self.behaviours = {'rss': StubBehaviour(), 'newsapi': StubBehaviour(), 'factcheck': StubBehaviour()}
+        self.behaviours.update(behaviours or {})
+        self.feeds = self._load_feeds()
+        self.newsapi_body = self._read('newsapi.json')
+        self.factcheck_body = self._read('factcheck.html')
+        self.request_counts = {kind: 0 for kind in self.behaviours}
+        self._lock = threading.Lock()
+
+        self.httpd = _StubHTTPServer((host, port), self._handler_class())
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def config_env(self):
+        """Environment variables that point Config/NewsVerifier at this server"""
+        return {
+            'NEWS_SOURCES': ','.join(f'{self.base_url}/rss/{name}' for name in sorted(self.feeds)),
+            'NEWS_API_URL': f'{self.base_url}/v2',
+            'FACT_CHECK_SEARCH_URL': f'{self.base_url}/search?q=site:{{site}} {{terms}}',
+        }
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name='stub-news-server', daemon=True)
+        self._thread.start()
+        logger.info(f"Stub news server listening on {self.base_url}")
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def _read(self, name):
+        with open(os.path.join(self.fixtures_dir, name), 'rb') as f:
+            return f.read()
+
+    def _load_feeds(self):
+        rss_dir = os.path.join(self.fixtures_dir, 'rss')
+        return {name: self._read(os.path.join('rss', name)) for name in os.listdir(rss_dir) if name.endswith('.xml')}
+
+    def _route(self, path):
+        """Map a request path to (kind, content type, body), or None"""
+        if path.startswith('/rss/'):
+            body = self.feeds.get(path[len('/rss/'):])
+            return ('rss', 'application/rss+xml', body) if body is not None else None
+        if path == '/v2/everything':
+            return 'newsapi', 'application/json', self.newsapi_body
+        if path == '/search':
+            return 'factcheck', 'text/html; charset=utf-8', self.factcheck_body
+        return None
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                route = server._route(urlparse(self.path).path)
+                if route is None:
+                    self.send_error(404)
+                    return
+
+                kind, content_type, body = route
+                behaviour = server.behaviours[kind]
+                with server._lock:
+                    server.request_counts[kind] += 1
+
+                roll = random.random()
+                if roll < behaviour.hang_rate:
+                    time.sleep(behaviour.hang_seconds)
+                time.sleep(behaviour.delay())
+
+                if roll >= 1 - behaviour.failure_rate:
+                    self.send_error(503, 'Injected failure')
+                    return
+
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+
+        return Handler
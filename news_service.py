@@ -0,0 +1,241 @@
+"""
+Asynchronous news verification server.
+
+    gunicorn -c gunicorn_news.conf.py news_service:app
+
+Serves the news routes of app.py (/verify, /verify_stream, /verify_batch,
+/api/feeds) from one event loop per worker process. A verification spends
+nearly all its time waiting on NewsAPI, feeds and fact-check sites, so a
+worker holds hundreds of them at once instead of one per thread, and they
+share one connection pool. Route these paths here and everything else to
+the Flask app (wsgi.py).
+"""
+import json
+import logging
+import os
+import functools
+from contextlib import aclosing
+
+import aiohttp
+from aiohttp import web
+
+from config import Config
+from news_verifier import NewsVerifier, parse_batch_headlines
+from worker_pools import AsyncRoutePool
+from request_profiler import RequestProfiler
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+news_verifier = NewsVerifier()
+news_pool = AsyncRoutePool('news', Config.NEWS_SERVICE_POOL_SIZE, Config.NEWS_POOL_QUEUE_TIMEOUT)
+
+HTTP_SESSION = web.AppKey('http_session', aiohttp.ClientSession)
+
+# Same profiling switches and directory as the Flask app; see /admin/profiles
+profiler = RequestProfiler(
+    directory=Config.PROFILE_DIR,
+    token=Config.PROFILE_TOKEN,
+    sample_rate=Config.PROFILE_SAMPLE_RATE,
+    max_files=Config.PROFILE_MAX_FILES,
+    interval=Config.PROFILE_INTERVAL_MS / 1000
+)
+
+
+def error_response(message, status):
+    return web.json_response({'error': message, 'status': 'error'}, status=status)
+
+
+def limit_concurrency(handler):
+    """Run a handler inside a news pool slot; streamed responses hold it until they finish"""
+    @functools.wraps(handler)
+    async def wrapper(request):
+        if not await news_pool.acquire():
+            logger.warning(f"news pool full ({news_pool.size} in flight), rejecting request")
+            response = error_response('Server busy, please retry shortly', 503)
+            response.headers['Retry-After'] = str(max(1, int(news_pool.queue_timeout)))
+            return response
+        try:
+            return await handler(request)
+        finally:
+            news_pool.release()
+    return wrapper
+
+
+@limit_concurrency
+async def verify_headline(request):
+    """Verify the submitted news headline"""
+    try:
+        if request.content_type == 'application/json':
+            data = await request.json()
+        else:
+            data = await request.post()
+        if not hasattr(data, 'get'):
+            data = {}
+        headline = str(data.get('headline') or '').strip()
+
+        if not headline:
+            return error_response('Please provide a news headline to verify', 400)
+
+        archive_only = str(data.get('archive_only', '')).lower() in ('1', 'true', 'yes')
+
+        logger.info(f"Verifying headline: {headline}")
+        result = await news_verifier.averify_headline(
+            headline, archive_only=archive_only, session=request.app[HTTP_SESSION]
+        )
+
+        return web.json_response({
+            'status': 'success',
+            'headline': headline,
+            'verification_result': result
+        })
+
+    except Exception as e:
+        logger.error(f"Error during verification: {str(e)}")
+        return error_response(f'Verification failed: {str(e)}', 500)
+
+
+@limit_concurrency
+async def verify_headline_stream(request):
+    """Verify a headline, streaming progress as Server-Sent Events"""
+    headline = request.query.get('headline', '').strip()
+
+    if not headline:
+        return error_response('Please provide a news headline to verify', 400)
+
+    logger.info(f"Streaming verification for headline: {headline}")
+
+    response = web.StreamResponse(headers={
+        'Content-Type': 'text/event-stream',
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+    await response.prepare(request)
+    # Closing the generator cancels the remaining fetches if the client goes away
+    try:
+        async with aclosing(news_verifier.astream_verify_headline(headline, session=request.app[HTTP_SESSION])) as events:
+            async for event in events:
+                await response.write(f"event: {event['event']}\ndata: {json.dumps(event['data'])}\n\n".encode())
+        await response.write_eof()
+    except ConnectionResetError:
+        logger.info(f"Client disconnected from streaming verification: {headline}")
+    return response
+
+
+@limit_concurrency
+async def verify_headline_batch(request):
+    """Verify a batch of headlines, fetching each source once for the whole batch"""
+    try:
+        data = await request.json()
+    except ValueError:
+        data = None
+
+    try:
+        headlines = parse_batch_headlines(data, Config.MAX_BATCH_HEADLINES)
+    except ValueError as e:
+        return error_response(str(e), 400)
+
+    logger.info(f"Verifying batch of {len(headlines)} headlines")
+    results = news_verifier.aiter_verify_headlines(headlines, session=request.app[HTTP_SESSION])
+
+    # Stream one JSON object per line for large batches
+    stream = data.get('stream') or request.query.get('stream') == '1' \
+        or 'application/x-ndjson' in request.headers.get('Accept', '')
+    if stream:
+        response = web.StreamResponse(headers={'Content-Type': 'application/x-ndjson'})
+        await response.prepare(request)
+        try:
+            async with aclosing(results):
+                async for result in results:
+                    await response.write((json.dumps({
+                        'status': 'success',
+                        'headline': result['headline'],
+                        'verification_result': result
+                    }) + '\n').encode())
+            await response.write_eof()
+        except ConnectionResetError:
+            logger.info(f"Client disconnected from batch of {len(headlines)} headlines")
+        return response
+
+    try:
+        async with aclosing(results):
+            results = [result async for result in results]
+    except Exception as e:
+        logger.error(f"Error during batch verification: {str(e)}")
+        return error_response(f'Batch verification failed: {str(e)}', 500)
+
+    return web.json_response({
+        'status': 'success',
+        'count': len(results),
+        'results': results
+    })
+
+
+async def feed_stats(request):
+    """Health, circuit state and refresh schedule of each RSS source in this worker"""
+    return web.json_response({'pid': os.getpid(), 'sources': news_verifier.feed_scheduler.stats()})
+
+
+async def pool_stats(request):
+    """Current load of this worker's news pool"""
+    return web.json_response({'pid': os.getpid(), 'news': news_pool.stats()})
+
+
+async def list_profiles(request):
+    """Recent request profiles, newest first (requires the profiling token)"""
+    if not profiler.is_authorized(request.headers):
+        return web.json_response({'error': 'Unauthorized'}, status=403)
+
+    profiles = profiler.list_profiles()
+    for profile in profiles:
+        profile['url'] = str(request.app.router['download_profile'].url_for(profile_id=profile['id']))
+    return web.json_response({'pid': os.getpid(), 'profiles': profiles})
+
+
+async def download_profile(request):
+    """A saved profile in speedscope format (open it at https://www.speedscope.app)"""
+    if not profiler.is_authorized(request.headers):
+        return web.json_response({'error': 'Unauthorized'}, status=403)
+
+    profile_id = request.match_info['profile_id']
+    path = profiler.profile_path(profile_id)
+    if path is None:
+        return web.json_response({'error': 'Profile not found'}, status=404)
+
+    return web.FileResponse(path, headers={
+        'Content-Type': 'application/json',
+        'Content-Disposition': f'attachment; filename="{profile_id}.speedscope.json"'
+    })
+
+
+async def open_http_session(app):
+    app[HTTP_SESSION] = news_verifier.http_session(Config.NEWS_SERVICE_CONNECTION_LIMIT)
+
+
+async def close_http_session(app):
+    await app[HTTP_SESSION].close()
+
+
+def create_app():
+    app = web.Application()
+    app.add_routes([
+        web.post('/verify', verify_headline),
+        web.get('/verify_stream', verify_headline_stream),
+        web.post('/verify_batch', verify_headline_batch),
+        web.get('/api/feeds', feed_stats),
+        web.get('/api/pools', pool_stats),
+        web.get('/admin/profiles', list_profiles),
+        web.get('/admin/profiles/{profile_id}', download_profile, name='download_profile'),
+    ])
+    profiler.init_aiohttp(app)
+    # One connection pool for every verification in this process
+    app.on_startup.append(open_http_session)
+    app.on_cleanup.append(close_http_session)
+    return app
+
+
+app = create_app()
+
+
+if __name__ == '__main__':
+    web.run_app(app, port=int(os.environ.get('NEWS_PORT', '8001')))
@@ -1,64 +1,154 @@
 
-import requests
+import asyncio
+import aiohttp
 import feedparser
-from newsapi import NewsApiClient
 from bs4 import BeautifulSoup
 import re
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
 from fuzzywuzzy import fuzz
 import json
 import logging
 from urllib.parse import urljoin, urlparse
 from config import Config
+from article_archive import ArticleArchive
+from feed_parser import parse_feed_content
+from gazetteer import get_gazetteer
+from feed_scheduler import FeedScheduler
 import time
 
+# Streamed event name -> the verification_method it reports
+STREAM_METHODS = {'newsapi': 'NewsAPI', 'feed': 'RSS_Feeds', 'fact_check': 'Fact_Check', 'archive': 'Archive'}
+
+
+def parse_batch_headlines(data, max_headlines):
+    """Headlines of a /verify_batch body; raises ValueError with a message for the client"""
+    if not isinstance(data, dict) or not isinstance(data.get('headlines'), list) \
+            or not all(isinstance(h, str) for h in data['headlines']):
+        raise ValueError('Request body must be a JSON object with "headlines" as a list of strings')
+
+    headlines = [h.strip() for h in data['headlines'] if h.strip()]
+    if not headlines:
+        raise ValueError('Please provide a list of news headlines to verify')
+    if len(headlines) > max_headlines:
+        raise ValueError(f'A batch may contain at most {max_headlines} headlines')
+    return headlines
+
+
+def _iterate_blocking(async_iterator):
+    """Iterate an async generator from blocking code on a private event loop"""
+    loop = asyncio.new_event_loop()
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(async_iterator.__anext__())
+            except StopAsyncIteration:
+                return
+    finally:
+        # Also runs when the consumer stops early, e.g. a disconnected client
+        loop.run_until_complete(async_iterator.aclose())
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.close()
+
+
 class NewsVerifier:
     def __init__(self):
         self.config = Config()
-        self.newsapi = None
-        if self.config.NEWS_API_KEY and self.config.NEWS_API_KEY != 'your-newsapi-key':
-            self.newsapi = NewsApiClient(api_key=self.config.NEWS_API_KEY)
+        self.newsapi_enabled = bool(self.config.NEWS_API_KEY and self.config.NEWS_API_KEY != 'your-newsapi-key')
         self.logger = logging.getLogger(__name__)
-        
-    def verify_headline(self, headline):
-        """Main verification function"""
-        verification_result = {
-            'headline': headline,
-            'authenticity_score': 0,
-            'verification_status': 'Unknown',
-            'sources_found': [],
-            'similar_headlines': [],
-            'summary': {
-                'what_happened': '',
-                'when_happened': '',
-                'where_happened': '',
-                'why_happened': ''
-            },
-            'details': {
-                'total_sources_checked': 0,
-                'matching_sources': 0,
-                'fact_check_results': [],
-                'verification_method': []
-            }
-        }
+        self.gazetteer = get_gazetteer(self.config.GAZETTEER_DIR)
+        # Health, circuit breakers and refresh scheduling for NEWS_SOURCES
+        self.feed_scheduler = FeedScheduler(
+            failure_threshold=self.config.FEED_FAILURE_THRESHOLD,
+            cooldown=self.config.FEED_CIRCUIT_COOLDOWN,
+            max_cooldown=self.config.FEED_CIRCUIT_MAX_COOLDOWN,
+            min_refresh=self.config.FEED_REFRESH_MIN_SECONDS,
+            max_refresh=self.config.FEED_REFRESH_MAX_SECONDS,
+            probe_timeout=self.config.FEED_TIMEOUT * 2
+        )
+        self.archive = None
+        if self.config.ARCHIVE_ENABLED:
+            try:
+                self.archive = ArticleArchive(
+                    self.config.ARCHIVE_PATH,
+                    retention_days=self.config.ARCHIVE_RETENTION_DAYS,
+                    compact_interval=self.config.ARCHIVE_COMPACT_INTERVAL
+                )
+            except Exception as e:
+                self.logger.error(f"Article archive unavailable: {str(e)}")
+    
+    # The pipeline is asynchronous; the blocking methods below drive it on a
+    # private event loop, and news_service serves it from a shared one
+    
+    def verify_headline(self, headline, archive_only=False):
+        """
+        Main verification function.
+        With archive_only, candidates come from the local article archive
+        and nothing is fetched live (NewsAPI, RSS feeds or fact-check sites).
+        """
+        return asyncio.run(self.averify_headline(headline, archive_only=archive_only))
+    
+    def stream_verify_headline(self, headline):
+        """Blocking astream_verify_headline"""
+        return _iterate_blocking(self.astream_verify_headline(headline))
+    
+    def verify_headlines(self, headlines):
+        """Verify a batch of headlines, returning one result per headline"""
+        return list(self.iter_verify_headlines(headlines))
+    
+    def iter_verify_headlines(self, headlines):
+        """Blocking aiter_verify_headlines"""
+        return _iterate_blocking(self.aiter_verify_headlines(headlines))
+    
+    def http_session(self, connection_limit=None):
+        """aiohttp session for the verification stages; one can be shared by many verifications"""
+        return aiohttp.ClientSession(
+            headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'},
+            connector=aiohttp.TCPConnector(limit=connection_limit or self.config.ASYNC_CONNECTION_LIMIT)
+        )
+    
+    @asynccontextmanager
+    async def _session(self, session=None):
+        """The caller's session, or one opened for the duration of a call"""
+        if session is not None:
+            yield session
+            return
+        async with self.http_session() as session:
+            yield session
+    
+    async def averify_headline(self, headline, archive_only=False, session=None):
+        """Asynchronous verify_headline; all network stages run concurrently"""
+        verification_result = self._new_result(headline)
+        live_urls = set()  # every article already scored from a live source
         
         try:
-            # Step 1: Search using NewsAPI (if available)
-            if self.newsapi:
-                verification_result = self._verify_with_newsapi(headline, verification_result)
-            
-            # Step 2: Search using RSS feeds and web scraping
-            verification_result = self._verify_with_rss_feeds(headline, verification_result)
+            if not archive_only:
+                async with self._session(session) as session:
+                    stages = []
+                    # Step 1: Search using NewsAPI (if available)
+                    if self.newsapi_enabled:
+                        stages.append(self._verify_with_newsapi(session, headline, verification_result, live_urls))
+                    
+                    # Step 2: Search using RSS feeds and web scraping
+                    stages.append(self._verify_with_rss_feeds(session, headline, verification_result, live_urls))
+                    
+                    # Step 3: Check fact-checking websites alongside the news sources
+                    stages.append(self._check_fact_checking_sites(session, headline, verification_result))
+                    
+                    await asyncio.gather(*stages)
             
-            # Step 3: Check fact-checking websites
-            verification_result = self._check_fact_checking_sites(headline, verification_result)
+            # Step 3b: Search previously seen articles in the local archive
+            if self.archive:
+                verification_result = await asyncio.to_thread(
+                    self._verify_with_archive, headline, verification_result, live_urls
+                )
             
             # Step 4: Calculate final authenticity score
             verification_result = self._calculate_authenticity_score(verification_result)
             
             # Step 5: Generate summary
             verification_result = self._generate_summary(verification_result)
-            
+        
         except Exception as e:
             self.logger.error(f"Error in headline verification: {str(e)}")
             verification_result['verification_status'] = 'Error'
@@ -66,169 +156,518 @@ class NewsVerifier:
         
         return verification_result
     
-    def _verify_with_newsapi(self, headline, result):
-        """Verify headline using NewsAPI"""
+    async def _verify_with_newsapi(self, session, headline, result, live_urls):
+        """Verify headline using NewsAPI without blocking"""
         try:
             self.logger.info("Verifying with NewsAPI...")
             result['details']['verification_method'].append('NewsAPI')
             
-            # Extract keywords from headline for search
-            keywords = self._extract_keywords(headline)
-            
-            # Ensure we have a valid search query
-            if not keywords or len(keywords) < 1:
-                # Fallback: use first few words of headline
-                words = headline.split()[:3]
-                search_query = ' '.join(words)
-            else:
-                # Use only the most important keywords (max 3) to avoid overly specific searches
-                search_query = ' '.join(keywords[:3])
-            
-            self.logger.info(f"Searching NewsAPI with query: '{search_query}'")
-            
-            # Search for articles
-            articles = self.newsapi.get_everything(
-                q=search_query,
-                language='en',
-                sort_by='relevancy',
-                page_size=20
-            )
-            
-            result['details']['total_sources_checked'] += len(articles['articles'])
-            
-            for article in articles['articles']:
-                try:
-                    # Use multiple similarity methods for better matching
-                    title = article['title'].lower()
-                    headline_lower = headline.lower()
-                    
-                    ratio = fuzz.ratio(headline_lower, title)
-                    partial = fuzz.partial_ratio(headline_lower, title)
-                    token_sort = fuzz.token_sort_ratio(headline_lower, title)
-                    
-                    # Use the highest similarity score
-                    similarity = max(ratio, partial, token_sort)
-                    
-                    self.logger.info(f"Article similarity: {similarity}% (ratio:{ratio}, partial:{partial}, token:{token_sort}) - {article['title'][:50]}...")
-                    
-                    if similarity > 35:  # Much lower threshold for better matching
-                        self.logger.info(f"Adding matching source: {article['source']['name']}")
-                        result['sources_found'].append({
-                            'source': article['source']['name'],
-                            'title': article['title'],
-                            'url': article['url'],
-                            'published_at': article['publishedAt'],
-                            'similarity_score': similarity,
-                            'description': article['description']
-                        })
-                        
-                        result['similar_headlines'].append({
-                            'title': article['title'],
-                            'similarity': similarity,
-                            'source': article['source']['name']
-                        })
-                        
-                        result['details']['matching_sources'] += 1
-                except Exception as e:
-                    self.logger.error(f"Error processing article: {e}")
-                    continue
-            
+            articles = await self._fetch_newsapi_articles(session, self._newsapi_query(headline))
+            self._score_newsapi_articles(headline.lower(), articles, result)
+            live_urls.update(article.get('url') for article in articles)
+        
         except Exception as e:
             self.logger.error(f"NewsAPI verification failed: {str(e)}")
             result['details']['newsapi_error'] = str(e)
         
         return result
     
-    def _verify_with_rss_feeds(self, headline, result):
-        """Verify headline using RSS feeds and web scraping"""
+    async def _fetch_newsapi_articles(self, session, search_query):
+        """Fetch candidate articles from the NewsAPI HTTP endpoint, archiving them"""
+        self.logger.info(f"Searching NewsAPI with query: '{search_query}'")
+        
+        base_url = (self.config.NEWS_API_URL or 'https://newsapi.org/v2').rstrip('/')
+        async with session.get(
+            f"{base_url}/everything",
+            params={'q': search_query, 'language': 'en', 'sortBy': 'relevancy', 'pageSize': 20},
+            headers={'X-Api-Key': self.config.NEWS_API_KEY},
+            timeout=aiohttp.ClientTimeout(total=self.config.REQUEST_TIMEOUT)
+        ) as response:
+            response.raise_for_status()
+            articles = await response.json()
+        
+        await asyncio.to_thread(self._archive_newsapi_articles, articles['articles'])
+        return articles['articles']
+    
+    async def _verify_with_rss_feeds(self, session, headline, result, live_urls):
+        """Verify headline using RSS feeds, downloading the stale ones concurrently"""
         try:
             self.logger.info("Verifying with RSS feeds...")
             result['details']['verification_method'].append('RSS_Feeds')
             
-            keywords = self._extract_keywords(headline)
-            
-            for feed_url in self.config.NEWS_SOURCES:
-                try:
-                    feed = feedparser.parse(feed_url)
-                    result['details']['total_sources_checked'] += len(feed.entries)
-                    
-                    for entry in feed.entries:
-                        # Use multiple similarity methods for better matching
-                        entry_title = entry.title.lower()
-                        headline_lower = headline.lower()
-                        
-                        ratio = fuzz.ratio(headline_lower, entry_title)
-                        partial = fuzz.partial_ratio(headline_lower, entry_title)
-                        token_sort = fuzz.token_sort_ratio(headline_lower, entry_title)
-                        
-                        # Use the highest similarity score
-                        similarity = max(ratio, partial, token_sort)
-                        
-                        if similarity > 30:  # Lower threshold for RSS feeds
-                            result['sources_found'].append({
-                                'source': feed.feed.get('title', 'RSS Feed'),
-                                'title': entry.title,
-                                'url': entry.link,
-                                'published_at': entry.get('published', ''),
-                                'similarity_score': similarity,
-                                'description': entry.get('summary', '')
-                            })
-                            
-                            result['similar_headlines'].append({
-                                'title': entry.title,
-                                'similarity': similarity,
-                                'source': feed.feed.get('title', 'RSS Feed')
-                            })
-                            
-                            result['details']['matching_sources'] += 1
-                
-                except Exception as e:
-                    self.logger.warning(f"Failed to parse RSS feed {feed_url}: {str(e)}")
+            headline_lower = headline.lower()
+            for feed_url, feed in await self._fetch_feeds(session):
+                if isinstance(feed, Exception):
+                    self.logger.warning(f"Failed to parse RSS feed {feed_url}: {str(feed)}")
                     continue
-                    
+                matches = self._score_feed(headline_lower, feed, result)
+                self.feed_scheduler.record_matches(feed_url, len(matches))
+                live_urls.update(entry.get('link') for entry in feed.entries)
+        
         except Exception as e:
             self.logger.error(f"RSS feed verification failed: {str(e)}")
         
         return result
     
-    def _check_fact_checking_sites(self, headline, result):
-        """Check fact-checking websites"""
+    async def _fetch_feeds(self, session):
+        """(url, feed or exception) for the healthy feeds in priority order, downloading only the stale ones"""
+        planned = self.feed_scheduler.plan(self.config.NEWS_SOURCES)
+        
+        async def resolve(feed_url, feed):
+            return feed if feed is not None else await self._fetch_feed(session, feed_url)
+        
+        feeds = await asyncio.gather(
+            *(resolve(feed_url, feed) for feed_url, feed in planned),
+            return_exceptions=True
+        )
+        return [(feed_url, feed) for (feed_url, _), feed in zip(planned, feeds)]
+    
+    async def _fetch_feed(self, session, feed_url):
+        """Download and parse an RSS feed without blocking, archiving its entries"""
+        started = time.monotonic()
+        try:
+            async with session.get(feed_url, timeout=aiohttp.ClientTimeout(total=self.config.FEED_TIMEOUT)) as response:
+                response.raise_for_status()
+                content = await response.read()
+            
+            if self.config.FAST_FEED_PARSER:
+                feed = parse_feed_content(content, feed_url)
+            else:
+                feed = feedparser.parse(content)
+            
+            # Neither parser raises on content that isn't a feed (an HTML error
+            # page, a truncated download): feedparser only sets bozo, and both
+            # leave the version empty
+            if not feed.entries and (feed.bozo or not getattr(feed, 'version', '')):
+                raise ValueError(f"Not a feed: {getattr(feed, 'bozo_exception', None) or 'no entries'}")
+        except Exception as e:
+            self.feed_scheduler.record_failure(feed_url, time.monotonic() - started, e)
+            raise
+        
+        self.feed_scheduler.record_success(feed_url, time.monotonic() - started, feed)
+        await asyncio.to_thread(self._archive_feed, feed)
+        return feed
+    
+    async def _check_fact_checking_sites(self, session, headline, result):
+        """Check fact-checking websites concurrently"""
         try:
             self.logger.info("Checking fact-checking sites...")
             result['details']['verification_method'].append('Fact_Check')
             
-            keywords = self._extract_keywords(headline)
-            search_terms = ' '.join(keywords[:3])
-            
-            for fact_site in self.config.FACT_CHECK_SOURCES:
-                try:
-                    # Simple Google search for fact-check results
-                    search_url = f"https://www.google.com/search?q=site:{fact_site} {search_terms}"
-                    headers = {
-                        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                    }
-                    
-                    response = requests.get(search_url, headers=headers, timeout=10)
-                    if response.status_code == 200:
-                        soup = BeautifulSoup(response.content, 'html.parser')
-                        search_results = soup.find_all('h3')
+            search_terms = ' '.join(self._extract_keywords(headline)[:3])
+            result['details']['fact_check_results'].extend(
+                await self._search_fact_checking_sites(session, search_terms)
+            )
+        
+        except Exception as e:
+            self.logger.error(f"Fact-checking failed: {str(e)}")
+        
+        return result
+    
+    async def _search_fact_checking_sites(self, session, search_terms):
+        """Search every fact-checking site for the given terms concurrently"""
+        sites = self.config.FACT_CHECK_SOURCES
+        checks = await asyncio.gather(
+            *(self._search_fact_checking_site(session, site, search_terms) for site in sites),
+            return_exceptions=True
+        )
+        
+        fact_check_results = []
+        for fact_site, check in zip(sites, checks):
+            if isinstance(check, Exception):
+                self.logger.warning(f"Failed to check {fact_site}: {str(check)}")
+            elif check:
+                fact_check_results.append(check)
+        return fact_check_results
+    
+    async def _search_fact_checking_site(self, session, fact_site, search_terms):
+        """Search a single fact-checking site, returning a result dict or None"""
+        search_url = self.config.FACT_CHECK_SEARCH_URL.format(site=fact_site, terms=search_terms)
+        
+        async with session.get(search_url, timeout=aiohttp.ClientTimeout(total=10)) as response:
+            if response.status != 200:
+                return None
+            content = await response.read()
+        
+        return self._parse_fact_check_page(fact_site, content)
+    
+    async def astream_verify_headline(self, headline, session=None):
+        """
+        Verify a headline progressively, yielding {'event', 'data'} dicts.
+        All sources are fetched concurrently and scored as soon as each one
+        finishes, with a provisional score after every update and the full
+        result in a final 'complete' event.
+        """
+        result = self._new_result(headline)
+        headline_lower = headline.lower()
+        search_terms = ' '.join(self._extract_keywords(headline)[:3])
+        live_urls = set()
+        
+        async with self._session(session) as session:
+            tasks = {}
+            try:
+                if self.newsapi_enabled:
+                    result['details']['verification_method'].append('NewsAPI')
+                    task = asyncio.ensure_future(self._fetch_newsapi_articles(session, self._newsapi_query(headline)))
+                    tasks[task] = ('newsapi', 'NewsAPI')
+                
+                result['details']['verification_method'].append('RSS_Feeds')
+                for feed_url, feed in self.feed_scheduler.plan(self.config.NEWS_SOURCES):
+                    if feed is None:
+                        task = asyncio.ensure_future(self._fetch_feed(session, feed_url))
+                    else:
+                        # Still-fresh cached feed, reported as soon as the loop starts
+                        task = asyncio.get_running_loop().create_future()
+                        task.set_result(feed)
+                    tasks[task] = ('feed', feed_url)
+                
+                result['details']['verification_method'].append('Fact_Check')
+                for fact_site in self.config.FACT_CHECK_SOURCES:
+                    task = asyncio.ensure_future(self._search_fact_checking_site(session, fact_site, search_terms))
+                    tasks[task] = ('fact_check', fact_site)
+                
+                pending = set(tasks)
+                while pending:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        stage, source = tasks[task]
+                        try:
+                            payload = task.result()
+                        except Exception as e:
+                            self.logger.warning(f"Streaming {stage} check failed for {source}: {str(e)}")
+                            if stage == 'newsapi':
+                                result['details']['newsapi_error'] = str(e)
+                            yield {'event': stage, 'data': {
+                                'method': STREAM_METHODS[stage], 'source': source, 'matches': [], 'error': str(e)
+                            }}
+                            continue
+                        
+                        if stage == 'newsapi':
+                            data = {'source': source, 'matches': self._score_newsapi_articles(headline_lower, payload, result)}
+                            live_urls.update(article.get('url') for article in payload)
+                        elif stage == 'feed':
+                            data = {'source': source, 'matches': self._score_feed(headline_lower, payload, result)}
+                            self.feed_scheduler.record_matches(source, len(data['matches']))
+                            live_urls.update(entry.get('link') for entry in payload.entries)
+                        else:
+                            if payload:
+                                result['details']['fact_check_results'].append(payload)
+                            data = {'source': source, 'result': payload}
                         
-                        if len(search_results) > 0:
-                            result['details']['fact_check_results'].append({
-                                'site': fact_site,
-                                'results_found': len(search_results),
-                                'status': 'Found related fact-checks'
-                            })
+                        data['method'] = STREAM_METHODS[stage]
+                        yield {'event': stage, 'data': data}
+                        
+                        result = self._calculate_authenticity_score(result)
+                        yield {'event': 'score', 'data': {
+                            'authenticity_score': result['authenticity_score'],
+                            'verification_status': result['verification_status'],
+                            'total_sources_checked': result['details']['total_sources_checked'],
+                            'matching_sources': result['details']['matching_sources']
+                        }}
                 
-                except Exception as e:
-                    self.logger.warning(f"Failed to check {fact_site}: {str(e)}")
-                    continue
+                if self.archive:
+                    before = len(result['sources_found'])
+                    result = await asyncio.to_thread(self._verify_with_archive, headline, result, live_urls)
+                    yield {'event': 'archive', 'data': {
+                        'method': STREAM_METHODS['archive'], 'source': 'Archive', 'matches': result['sources_found'][before:]
+                    }}
+                
+                result = self._calculate_authenticity_score(result)
+                result = self._generate_summary(result)
+            
+            except Exception as e:
+                self.logger.error(f"Error in streaming headline verification: {str(e)}")
+                result['verification_status'] = 'Error'
+                result['error'] = str(e)
+            
+            finally:
+                # Don't keep fetching the remaining slow sources for a disconnected client
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+        
+        yield {'event': 'complete', 'data': result}
+    
+    def _new_result(self, headline):
+        """Create an empty verification result for a headline"""
+        return {
+            'headline': headline,
+            'authenticity_score': 0,
+            'verification_status': 'Unknown',
+            'sources_found': [],
+            'similar_headlines': [],
+            'summary': {
+                'what_happened': '',
+                'when_happened': '',
+                'where_happened': '',
+                'why_happened': ''
+            },
+            'details': {
+                'total_sources_checked': 0,
+                'matching_sources': 0,
+                'fact_check_results': [],
+                'verification_method': []
+            }
+        }
+    
+    async def aiter_verify_headlines(self, headlines, session=None):
+        """
+        Verify a batch of headlines, yielding each result in input order as
+        soon as it is scored. Every feed, distinct NewsAPI query and distinct
+        fact-check search is fetched once per batch; each headline is scored
+        against its own NewsAPI results, the feeds and the archive, like a
+        single verification.
+        """
+        results = [self._new_result(headline) for headline in headlines]
+        if not results:
+            return
+        
+        queries = [self._newsapi_query(headline) if self.newsapi_enabled else None for headline in headlines]
+        search_terms = [' '.join(self._extract_keywords(headline)[:3]) for headline in headlines]
+        
+        async with self._session(session) as session:
+            # Fact-check searches (every site for each distinct set of terms) run
+            # in the background while headlines are scored, a few terms at a time
+            limiter = asyncio.Semaphore(self.config.BATCH_FACT_CHECK_CONCURRENCY)
+            
+            async def fact_check(terms):
+                async with limiter:
+                    return await self._search_fact_checking_sites(session, terms)
+            
+            fact_checks = {terms: asyncio.ensure_future(fact_check(terms)) for terms in dict.fromkeys(search_terms)}
+            try:
+                newsapi_results = {}
+                if self.newsapi_enabled:
+                    unique_queries = list(dict.fromkeys(queries))
+                    self.logger.info(f"Batch NewsAPI: {len(unique_queries)} unique queries for {len(headlines)} headlines")
+                    responses = await asyncio.gather(
+                        *(self._fetch_newsapi_articles(session, query) for query in unique_queries),
+                        return_exceptions=True
+                    )
+                    newsapi_results = dict(zip(unique_queries, responses))
+                
+                feeds = []
+                for feed_url, feed in await self._fetch_feeds(session):
+                    if isinstance(feed, Exception):
+                        self.logger.warning(f"Failed to parse RSS feed {feed_url}: {str(feed)}")
+                        continue
+                    feeds.append((feed_url, feed))
+                feed_matches = {feed_url: 0 for feed_url, _ in feeds}
+                
+                for result, query, terms in zip(results, queries, search_terms):
+                    try:
+                        if self.newsapi_enabled:
+                            result['details']['verification_method'].append('NewsAPI')
+                        result['details']['verification_method'].append('RSS_Feeds')
+                        # Scoring holds the GIL, but a thread still lets the event loop switch in
+                        result = await asyncio.to_thread(
+                            self._score_batch_headline, result, newsapi_results.get(query), feeds, feed_matches
+                        )
+                        
+                        result['details']['verification_method'].append('Fact_Check')
+                        result['details']['fact_check_results'].extend(await fact_checks[terms])
+                        
+                        result = self._calculate_authenticity_score(result)
+                        result = self._generate_summary(result)
+                    
+                    except Exception as e:
+                        self.logger.error(f"Error in batch headline verification: {str(e)}")
+                        result['verification_status'] = 'Error'
+                        result['error'] = str(e)
                     
+                    yield result
+                
+                for feed_url, matches in feed_matches.items():
+                    self.feed_scheduler.record_matches(feed_url, matches, headlines=len(headlines))
+            
+            finally:
+                for task in fact_checks.values():
+                    task.cancel()
+                await asyncio.gather(*fact_checks.values(), return_exceptions=True)
+    
+    def _score_batch_headline(self, result, articles, feeds, feed_matches):
+        """Score one batch headline against its NewsAPI articles, the batch's feeds and the archive"""
+        headline = result['headline']
+        headline_lower = headline.lower()
+        live_urls = set()
+        
+        if isinstance(articles, Exception):
+            result['details']['newsapi_error'] = str(articles)
+        elif articles is not None:
+            self._score_newsapi_articles(headline_lower, articles, result)
+            live_urls.update(article.get('url') for article in articles)
+        
+        for feed_url, feed in feeds:
+            feed_matches[feed_url] += len(self._score_feed(headline_lower, feed, result))
+            live_urls.update(entry.get('link') for entry in feed.entries)
+        
+        if self.archive:
+            result = self._verify_with_archive(headline, result, live_urls)
+        
+        return result
+    
+    def _similarity(self, headline_lower, title_lower):
+        """Highest of several fuzzy similarity scores between two lowercased strings"""
+        ratio = fuzz.ratio(headline_lower, title_lower)
+        partial = fuzz.partial_ratio(headline_lower, title_lower)
+        token_sort = fuzz.token_sort_ratio(headline_lower, title_lower)
+        return max(ratio, partial, token_sort)
+    
+    def _add_match(self, result, source, title, url, published_at, similarity, description):
+        """Record a matching article in a verification result and return it"""
+        match = {
+            'source': source,
+            'title': title,
+            'url': url,
+            'published_at': published_at,
+            'similarity_score': similarity,
+            'description': description
+        }
+        result['sources_found'].append(match)
+        
+        result['similar_headlines'].append({
+            'title': title,
+            'similarity': similarity,
+            'source': source
+        })
+        
+        result['details']['matching_sources'] += 1
+        return match
+    
+    def _newsapi_query(self, headline):
+        """Build the NewsAPI search query for a headline"""
+        # Extract keywords from headline for search
+        keywords = self._extract_keywords(headline)
+        
+        # Ensure we have a valid search query
+        if not keywords or len(keywords) < 1:
+            # Fallback: use first few words of headline
+            words = headline.split()[:3]
+            return ' '.join(words)
+        # Use only the most important keywords (max 3) to avoid overly specific searches
+        return ' '.join(keywords[:3])
+    
+    def _archive_newsapi_articles(self, articles):
+        """Store NewsAPI articles in the local archive"""
+        self._archive_articles([{
+            'url': article.get('url'),
+            'source': (article.get('source') or {}).get('name'),
+            'title': article.get('title'),
+            'description': article.get('description'),
+            'published_at': article.get('publishedAt')
+        } for article in articles])
+    
+    def _archive_feed(self, feed):
+        """Store the entries of a parsed feed in the local archive"""
+        feed_title = feed.feed.get('title', 'RSS Feed')
+        self._archive_articles([{
+            'url': entry.get('link'),
+            'source': feed_title,
+            'title': entry.get('title'),
+            'description': entry.get('summary', ''),
+            'published_at': entry.get('published', '')
+        } for entry in feed.entries])
+    
+    def _archive_articles(self, articles):
+        """Store fetched articles in the local archive, if enabled"""
+        if not self.archive:
+            return
+        
+        try:
+            self.archive.add_articles(articles)
         except Exception as e:
-            self.logger.error(f"Fact-checking failed: {str(e)}")
+            self.logger.warning(f"Failed to archive articles: {str(e)}")
+    
+    def _score_newsapi_articles(self, headline_lower, articles, result):
+        """Score NewsAPI articles against a headline, returning the new matches"""
+        result['details']['total_sources_checked'] += len(articles)
+        matches = []
+        
+        for article in articles:
+            try:
+                # Use multiple similarity methods for better matching
+                similarity = self._similarity(headline_lower, article['title'].lower())
+                
+                self.logger.info(f"Article similarity: {similarity}% - {article['title'][:50]}...")
+                
+                if similarity > 35:  # Much lower threshold for better matching
+                    self.logger.info(f"Adding matching source: {article['source']['name']}")
+                    matches.append(self._add_match(
+                        result, article['source']['name'], article['title'], article['url'],
+                        article['publishedAt'], similarity, article['description']
+                    ))
+            except Exception as e:
+                self.logger.error(f"Error processing article: {e}")
+                continue
+        
+        return matches
+    
+    def _score_feed(self, headline_lower, feed, result):
+        """Score a parsed RSS feed against a headline, returning the new matches"""
+        result['details']['total_sources_checked'] += len(feed.entries)
+        matches = []
+        
+        for entry in feed.entries:
+            # Use multiple similarity methods for better matching
+            similarity = self._similarity(headline_lower, entry.title.lower())
+            
+            if similarity > 30:  # Lower threshold for RSS feeds
+                matches.append(self._add_match(
+                    result, feed.feed.get('title', 'RSS Feed'), entry.title, entry.link,
+                    entry.get('published', ''), similarity, entry.get('summary', '')
+                ))
+        
+        return matches
+    
+    def _verify_with_archive(self, headline, result, live_urls=()):
+        """
+        Verify headline against previously seen articles in the local archive.
+        live_urls are the articles already scored from live sources in this
+        verification; they are skipped so a live candidate rejected by its
+        source's threshold isn't re-scored (and counted) from the archive.
+        """
+        try:
+            self.logger.info("Verifying with article archive...")
+            result['details']['verification_method'].append('Archive')
+            
+            candidates = self.archive.search(
+                ' '.join(self._extract_keywords(headline)) or headline,
+                limit=self.config.ARCHIVE_CANDIDATE_LIMIT
+            )
+            
+            # Skip articles already scored from live sources
+            seen_urls = set(live_urls) | {source['url'] for source in result['sources_found']}
+            candidates = [c for c in candidates if c['url'] not in seen_urls]
+            result['details']['total_sources_checked'] += len(candidates)
+            headline_lower = headline.lower()
+            
+            for candidate in candidates:
+                similarity = self._similarity(headline_lower, candidate['title'].lower())
+                
+                if similarity > 30:
+                    self._add_match(
+                        result, candidate['source'] or 'Archive', candidate['title'], candidate['url'],
+                        candidate['published_at'], similarity, candidate['description']
+                    )
+        
+        except Exception as e:
+            self.logger.error(f"Archive verification failed: {str(e)}")
         
         return result
     
+    def _parse_fact_check_page(self, fact_site, content):
+        """Count search results on a fact-check search page, returning a result dict or None"""
+        soup = BeautifulSoup(content, 'html.parser')
+        search_results = soup.find_all('h3')
+        
+        if len(search_results) > 0:
+            return {
+                'site': fact_site,
+                'results_found': len(search_results),
+                'status': 'Found related fact-checks'
+            }
+        return None
+    
     def _calculate_authenticity_score(self, result):
         """Calculate overall authenticity score"""
         score = 0
@@ -302,8 +741,9 @@ class NewsVerifier:
         # Extract Where happened
         description = best_source.get('description', '')
         if description:
-            # Simple location extraction (can be improved with NLP)
-            locations = re.findall(r'\b(?:in|at)\s+([A-Z][a-zA-Z\s]+?)(?:[,.]|\s+(?:said|reported|according))', description)
+            # Known places from the gazetteer, then a simple "in/at <Place>" pattern
+            places = self.gazetteer.scan(description).places
+            locations = [places[0]['text']] if places else re.findall(r'\b(?:in|at)\s+([A-Z][a-zA-Z\s]+?)(?:[,.]|\s+(?:said|reported|according))', description)
             if locations:
                 result['summary']['where_happened'] = f"Location mentioned: {locations[0].strip()}"
             else:
@@ -319,19 +759,20 @@ class NewsVerifier:
     
     def _extract_keywords(self, text):
         """Extract keywords from text"""
-        # Remove common stop words and extract meaningful terms
-        stop_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should', 'breaking', 'news', 'update', 'report', 'says', 'share', 'warm', 'hugs', 'snubbing', 'after', 'with', 'in', 'after', 'leaves', 'two', 'jawans', 'dead', 'locals', 'protest', 'nambol', 'assam', 'rifles', 'ambush'}
-        
-        # Clean and split text
-        words = re.findall(r'\b\w+\b', text.lower())
-        keywords = [word for word in words if word not in stop_words and len(word) > 2]
+        # One gazetteer pass flags stop words, priority terms and place names
+        scan = self.gazetteer.scan(text)
         
         # Prioritize important keywords (nouns, locations, events)
         priority_keywords = []
-        for word in keywords:
-            if len(word) > 4 or word in ['war', 'fire', 'crash', 'storm', 'flood', 'covid', 'virus', 'india', 'manipur', 'assam', 'kashmir', 'pakistan', 'china', 'bengal', 'maharashtra', 'gujarat', 'rajasthan', 'punjab', 'haryana', 'delhi', 'mumbai', 'bangalore', 'hyderabad', 'chennai', 'kolkata', 'ahmedabad', 'pune', 'jaipur', 'lucknow', 'kanpur', 'nagpur', 'indore', 'bhopal', 'ludhiana', 'agra', 'nashik', 'faridabad', 'meerut', 'rajkot', 'kalyan', 'vasai', 'varanasi', 'srinagar', 'aurangabad', 'navi', 'solapur', 'vadodara', 'patna', 'meerut', 'rajkot', 'kalyan', 'vasai', 'varanasi', 'srinagar', 'aurangabad', 'navi', 'solapur', 'vadodara', 'patna']:
+        other_keywords = []
+        for word, is_stop, is_priority in zip(scan.tokens, scan.stop, scan.priority):
+            if is_stop or len(word) <= 2:
+                continue
+            if len(word) > 4 or is_priority:
                 priority_keywords.append(word)
+            else:
+                other_keywords.append(word)
         
         # Return priority keywords first, then others
-        result = priority_keywords + [w for w in keywords if w not in priority_keywords]
+        result = priority_keywords + other_keywords
         return result[:10]  # Return top 10 keywords
@@ -0,0 +1,234 @@
+import os
+import time
+import threading
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import librosa
+import matplotlib
+matplotlib.use('Agg')  # Use non-GUI backend
+import matplotlib.style
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+DPI = 150
+FACECOLOR = '#1a1a2e'
+STYLE = 'dark_background'
+
+# Plotted data is reduced to about this many points/columns, a little more
+# than the 12 inch x 150 dpi output is wide, so cost doesn't grow with duration
+MAX_COLUMNS = 2000
+
+PLOT_KINDS = ('waveform', 'mfcc', 'spectrogram', 'frequency')
+
+
+# ==================== DATA PREPARATION (caller's process) ====================
+
+def _envelope(x, values, points=MAX_COLUMNS):
+    """Interleaved per-bin min/max of values, which draws the same as the full line"""
+    if len(values) <= 2 * points:
+        return x, values
+    size = len(values) // points
+    binned = values[:size * points].reshape(points, size)
+    centers = x[:size * points].reshape(points, size)[:, size // 2]
+    return np.repeat(centers, 2), np.column_stack([binned.min(axis=1), binned.max(axis=1)]).ravel()
+
+
+def _reduce_columns(matrix, reducer, columns=MAX_COLUMNS):
+    """Pool groups of adjacent columns so at most `columns` remain"""
+    size = -(-matrix.shape[1] // columns)
+    if size <= 1:
+        return matrix
+    pad = (-matrix.shape[1]) % size
+    if pad:
+        matrix = np.concatenate([matrix, np.repeat(matrix[:, -1:], pad, axis=1)], axis=1)
+    return reducer(matrix.reshape(matrix.shape[0], -1, size), axis=2)
+
+
+def prepare_plot_data(kind, analysis):
+    """
+    Reduce an AudioAnalysis to the small arrays a plot needs. Shared
+    intermediates (signal, STFT, MFCC) come from the analysis, so plots
+    reuse the work done for feature extraction. The waveform always shows
+    the whole file; the other plots cover the analysed (possibly
+    silence-trimmed) signal.
+    """
+    sr = analysis.get('sr')
+
+    if kind == 'waveform':
+        y_full = analysis.get('y_full')
+        time, amplitude = _envelope(np.arange(len(y_full)) / sr, y_full)
+        return {'x': time, 'y': amplitude, 'xlabel': 'Time (seconds)'}
+
+    y = analysis.get('y')
+    duration = len(y) / sr
+    time_label = 'Speech time (seconds)' if len(y) < len(analysis.get('y_full')) else 'Time (seconds)'
+
+    if kind == 'frequency':
+        magnitude = np.abs(np.fft.rfft(y))
+        frequency = np.fft.rfftfreq(len(y), 1 / sr)
+        visible = frequency <= 8000  # Focus on human speech range
+        frequency, magnitude = _envelope(frequency[visible], magnitude[visible])
+        return {'x': frequency, 'y': magnitude, 'xlim': (0, 8000), 'xlabel': 'Frequency (Hz)'}
+
+    if kind == 'mfcc':
+        mfccs = _reduce_columns(analysis.get('mfcc'), np.mean)
+        return {'image': mfccs, 'extent': (0, duration, 0, mfccs.shape[0]), 'xlabel': time_label}
+
+    if kind == 'spectrogram':
+        D = librosa.amplitude_to_db(analysis.get('stft_magnitude'), ref=np.max)
+        return {'image': _reduce_columns(D, np.max), 'extent': (0, duration, 0, sr / 2), 'xlabel': time_label}
+
+    raise ValueError(f"Unknown plot kind: {kind}")
+
+
+# ==================== FIGURE TEMPLATES (render process) ====================
+
+def _new_axes(figsize, title, ylabel):
+    figure = Figure(figsize=figsize, dpi=DPI, layout='tight')
+    FigureCanvasAgg(figure)
+    ax = figure.add_subplot()
+    ax.set_title(title, fontsize=16, color='white')
+    ax.set_ylabel(ylabel, fontsize=12, color='white')
+    return figure, ax
+
+
+def _set_xlabel(ax, data):
+    ax.set_xlabel(data['xlabel'], fontsize=12, color='white')
+
+
+def _line_template(figsize, title, ylabel, color, linewidth):
+    figure, ax = _new_axes(figsize, title, ylabel)
+    line, = ax.plot([], [], color=color, linewidth=linewidth)
+    ax.grid(True, alpha=0.3)
+
+    def update(data):
+        _set_xlabel(ax, data)
+        line.set_data(data['x'], data['y'])
+        ax.relim()
+        ax.autoscale_view()
+        if 'xlim' in data:
+            ax.set_xlim(*data['xlim'])
+
+    return figure, update
+
+
+def _image_template(figsize, title, ylabel, cmap, colorbar_label):
+    figure, ax = _new_axes(figsize, title, ylabel)
+    image = ax.imshow(np.zeros((2, 2)), origin='lower', aspect='auto', cmap=cmap, interpolation='nearest')
+    figure.colorbar(image, ax=ax, label=colorbar_label)
+
+    def update(data):
+        _set_xlabel(ax, data)
+        image.set_data(data['image'])
+        image.set_extent(data['extent'])
+        image.set_clim(float(np.min(data['image'])), float(np.max(data['image'])))
+
+    return figure, update
+
+
+_TEMPLATE_BUILDERS = {
+    'waveform': lambda: _line_template((12, 4), 'Audio Waveform', 'Amplitude', '#00ffff', 0.5),
+    'frequency': lambda: _line_template((12, 4), 'Frequency Domain Analysis', 'Magnitude', '#ff6b6b', 0.8),
+    'mfcc': lambda: _image_template((12, 6), 'MFCC Features', 'MFCC Coefficients', 'plasma', 'MFCC Coefficients'),
+    'spectrogram': lambda: _image_template((12, 6), 'Spectrogram', 'Frequency (Hz)', 'magma', 'Amplitude (dB)'),
+}
+
+# Per-process figure templates, built on first use and reused for every job
+_templates = {}
+
+
+def render_plot(kind, data, output_path):
+    """Swap data into this process's template for kind and write it to output_path"""
+    with matplotlib.style.context(STYLE):
+        if kind not in _templates:
+            _templates[kind] = _TEMPLATE_BUILDERS[kind]()
+        figure, update = _templates[kind]
+        update(data)
+        figure.savefig(output_path, dpi=DPI, bbox_inches='tight', facecolor=FACECOLOR)
+    return output_path
+
+
+class PlotRenderer:
+    """
+    Renders plots in a small process pool whose workers keep one figure
+    template per kind, so a job only updates data and redraws the canvas.
+    A request's plots are submitted together and render in parallel.
+    With workers=0, or while the pool keeps dying, plots render one at a
+    time in the calling process.
+    """
+
+    def __init__(self, workers=2, retry_backoff=10, max_retry_backoff=600):
+        self.workers = workers
+        self.retry_backoff = retry_backoff  # seconds in-process after the pool dies, doubling per death
+        self.max_retry_backoff = max_retry_backoff
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._render_lock = threading.Lock()  # pyplot-free, but templates are shared in-process
+        self._executor = None
+        self._executor_pid = None
+        self._pool_failures = 0  # pool deaths since a job last completed in it
+        self._pool_retry_at = 0.0
+
+    def _get_executor(self):
+        """Start the pool lazily in each process; a pool inherited across fork is unusable"""
+        with self._lock:
+            if self._executor is None or self._executor_pid != os.getpid():
+                # Fork a clean helper instead of this (possibly multi-threaded) process
+                method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+                context = multiprocessing.get_context(method)
+                if method == 'forkserver':
+                    # The server imports numpy, librosa and matplotlib once and
+                    # pool processes share those pages instead of each importing them
+                    context.set_forkserver_preload([__name__])
+                self._executor = ProcessPoolExecutor(self.workers, mp_context=context)
+                self._executor_pid = os.getpid()
+            return self._executor
+
+    def _reset_executor(self, executor):
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+            # Back off while the pool keeps dying (e.g. workers OOM-killed, or
+            # unable to start when __main__ can't be re-imported), but retry
+            self._pool_failures += 1
+            backoff = min(self.retry_backoff * 2 ** (self._pool_failures - 1), self.max_retry_backoff)
+            self._pool_retry_at = time.monotonic() + backoff
+            self.logger.warning(f"Plot render pool died ({self._pool_failures} in a row), "
+                                f"rendering in-process for {backoff:.0f}s")
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _render_inline(self, jobs):
+        with self._render_lock:
+            for kind, data, output_path in jobs:
+                render_plot(kind, data, output_path)
+
+    def render(self, jobs):
+        """Render [(kind, data, output_path)] and return once every file is written"""
+        if self.workers <= 0 or time.monotonic() < self._pool_retry_at:
+            self._render_inline(jobs)
+            return
+
+        executor = self._get_executor()
+        try:
+            futures = [executor.submit(render_plot, kind, data, os.path.abspath(output_path))
+                       for kind, data, output_path in jobs]
+            # Wait for every job, even after a failure, so none is still writing
+            # when the caller cleans up its output paths
+            wait(futures)
+            for future in futures:
+                future.result()
+            self._pool_failures = 0
+        except BrokenProcessPool:
+            self.logger.error("Plot render pool died, rendering this request in-process")
+            self._reset_executor(executor)
+            self._render_inline(jobs)
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None and self._executor_pid == os.getpid():
+                self._executor.shutdown(wait=True)
+            self._executor = None
@@ -0,0 +1,388 @@
+import os
+import sys
+import json
+import asyncio
+import time
+import random
+import secrets
+import threading
+import contextvars
+import weakref
+import logging
+
+from aiohttp import web
+from flask import request, g
+
+# Profile of the request being handled, visible to code running on its behalf
+_active_profile = contextvars.ContextVar('active_profile', default=None)
+
+# Tasks created while a profile was active, on event loops shared by many
+# requests (see track_tasks)
+_task_profiles = weakref.WeakKeyDictionary()
+
+
+def _thread_frames(frame):
+    """A thread's frames, outermost first"""
+    frames = []
+    while frame is not None:
+        frames.append(frame)
+        frame = frame.f_back
+    frames.reverse()
+    return frames
+
+
+def _task_frames(task):
+    """The frames of a task's chain of awaiting coroutines, outermost first"""
+    frames = []
+    awaitable = task.get_coro()
+    while awaitable is not None:
+        frame = getattr(awaitable, 'cr_frame', None) or getattr(awaitable, 'gi_frame', None) \
+            or getattr(awaitable, 'ag_frame', None)
+        if frame is None:
+            break
+        frames.append(frame)
+        awaitable = getattr(awaitable, 'cr_await', None) or getattr(awaitable, 'gi_yieldfrom', None) \
+            or getattr(awaitable, 'ag_await', None)
+    return frames
+
+
+def _idle_event_loop(frame):
+    """The event loop a thread is running, if it is waiting in its selector; else None"""
+    code = frame.f_code
+    if code.co_name != 'select' or not code.co_filename.endswith('selectors.py'):
+        return None
+    while frame is not None:
+        if frame.f_code.co_name == '_run_once':
+            loop = frame.f_locals.get('self')
+            return loop if isinstance(loop, asyncio.AbstractEventLoop) else None
+        frame = frame.f_back
+    return None
+
+
+def track_tasks(loop):
+    """Attribute each task created on loop to the profile active in its creator's context"""
+    if getattr(loop.get_task_factory(), 'tracks_profiles', False):
+        return
+    default_factory = loop.get_task_factory()
+
+    def factory(loop, coro, **kwargs):
+        if default_factory is not None:
+            task = default_factory(loop, coro, **kwargs)
+        else:
+            task = asyncio.Task(coro, loop=loop, **kwargs)
+        profile = _active_profile.get()
+        if profile is not None:
+            _task_profiles[task] = profile
+        return task
+
+    factory.tracks_profiles = True
+    loop.set_task_factory(factory)
+
+
+class StackSampler(threading.Thread):
+    """
+    Wall-clock sampling profiler: every interval, record the Python stack of
+    each tracked thread. Sampling wall time (not CPU time) shows where a slow
+    request waits as well as where it computes.
+
+    A thread whose event loop is waiting for I/O would only show the
+    selector, so instead each of the loop's pending tasks is recorded with
+    its chain of awaiting coroutines, sharing the interval's weight.
+
+    On a loop shared by many requests, owns_task picks this request's
+    tasks; while the loop runs another request's code the sample is
+    recorded as waiting for the event loop.
+    """
+
+    def __init__(self, interval=0.005, loop=None, owns_task=None):
+        super().__init__(name='request-profiler', daemon=True)
+        self.interval = interval
+        self.loop = loop
+        self.owns_task = owns_task
+        self.frames = []  # shared speedscope frames
+        self.samples = {}  # thread id -> ([stack], [weight])
+        self._frame_index = {}
+        self._thread_ids = set()
+        self._stop_event = threading.Event()
+        self.started_at = time.perf_counter()
+        self.duration = 0.0
+
+    def track(self, thread_id):
+        self._thread_ids.add(thread_id)
+
+    def _frame(self, name, file='', line=0):
+        """Speedscope frame index of a code location"""
+        key = (name, file, line)
+        index = self._frame_index.get(key)
+        if index is None:
+            index = self._frame_index[key] = len(self.frames)
+            self.frames.append({'name': name, 'file': file, 'line': line})
+        return index
+
+    def _stack(self, frames):
+        """Speedscope frame indexes of frames, outermost first"""
+        return [self._frame(f.f_code.co_name, f.f_code.co_filename, f.f_code.co_firstlineno) for f in frames]
+
+    def _sample(self, frame):
+        """Stacks for one thread at this instant"""
+        loop = _idle_event_loop(frame)
+        if loop is not None:
+            try:
+                tasks = asyncio.all_tasks(loop)
+            except RuntimeError:
+                tasks = ()
+            if self.owns_task is not None:
+                tasks = [task for task in tasks if self.owns_task(task)]
+            stacks = [self._stack(_task_frames(task)) for task in tasks]
+            stacks = [stack for stack in stacks if stack]
+            if stacks:
+                return stacks
+        elif self.loop is not None and self.owns_task is not None:
+            current = asyncio.current_task(self.loop)
+            if current is None or not self.owns_task(current):
+                return [[self._frame('(event loop busy with other requests)')]]
+        return [self._stack(_thread_frames(frame))]
+
+    def run(self):
+        last = time.perf_counter()
+        while not self._stop_event.wait(self.interval):
+            now = time.perf_counter()
+            elapsed, last = now - last, now
+            frames = sys._current_frames()
+            for thread_id in list(self._thread_ids):
+                frame = frames.get(thread_id)
+                if frame is not None:
+                    stacks, weights = self.samples.setdefault(thread_id, ([], []))
+                    sampled = self._sample(frame)
+                    stacks.extend(sampled)
+                    weights.extend([elapsed * 1000 / len(sampled)] * len(sampled))
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+        self.duration = time.perf_counter() - self.started_at
+
+    def to_speedscope(self, name):
+        profiles = []
+        for thread_id, (stacks, weights) in self.samples.items():
+            total = sum(weights)
+            profiles.append({
+                'type': 'sampled',
+                'name': f'{name} (thread {thread_id})',
+                'unit': 'milliseconds',
+                'startValue': 0,
+                'endValue': total,
+                'samples': stacks,
+                'weights': weights
+            })
+        return {
+            '$schema': 'https://www.speedscope.app/file-format-schema.json',
+            'shared': {'frames': self.frames},
+            'profiles': profiles,
+            'name': name,
+            'exporter': 'request_profiler'
+        }
+
+
+class RequestProfiler:
+    """
+    Opt-in request profiling. A request is profiled when an authorized
+    caller asks for it (X-Profile: 1 header or ?profile=1, with the token
+    in the X-Profile-Token header so it stays out of access logs) or when
+    it is picked by random sampling. The trace is saved as a speedscope file (open it at
+    https://www.speedscope.app) in a directory that keeps only the most
+    recent max_files profiles, and the response carries its id in
+    X-Profile-Id.
+    """
+
+    def __init__(self, app=None, directory='profiles', token=None, sample_rate=0.0,
+                 max_files=200, interval=0.005):
+        self.directory = directory
+        self.token = token
+        self.sample_rate = sample_rate
+        self.max_files = max_files
+        self.interval = interval
+        self.logger = logging.getLogger(__name__)
+        self._prune_lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        os.makedirs(self.directory, exist_ok=True)
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+
+        # Async views run their event loop in another thread; track it too
+        async_to_sync = app.async_to_sync
+
+        def profiled_async_to_sync(func):
+            async def tracked(*args, **kwargs):
+                sampler = (_active_profile.get() or {}).get('sampler')
+                if sampler is not None:
+                    sampler.track(threading.get_ident())
+                return await func(*args, **kwargs)
+            return async_to_sync(tracked)
+
+        app.async_to_sync = profiled_async_to_sync
+
+    def init_aiohttp(self, app):
+        """Profile requests of an aiohttp application, whose handlers share one event loop per process"""
+        os.makedirs(self.directory, exist_ok=True)
+        app.middlewares.append(self._aiohttp_middleware)
+        # Streamed responses send their headers before the handler returns
+        app.on_response_prepare.append(self._set_profile_header)
+
+    def is_authorized(self, headers=None):
+        """True if the request (Flask's current one by default) carries the profiling token"""
+        supplied = (request.headers if headers is None else headers).get('X-Profile-Token')
+        return bool(self.token and supplied and secrets.compare_digest(supplied, self.token))
+
+    def _trigger(self, headers, args):
+        """Why a request with these headers and query arguments is profiled, or None"""
+        flag = headers.get('X-Profile') or args.get('profile')
+        if flag in ('1', 'true', 'yes') and self.is_authorized(headers):
+            return 'requested'
+        if self.sample_rate and random.random() < self.sample_rate:
+            return 'sampled'
+        return None
+
+    def _start(self, trigger, method, path, endpoint, sampler):
+        sampler.start()
+        return {
+            'id': f"{time.strftime('%Y%m%dT%H%M%S')}-{secrets.token_hex(4)}",
+            'sampler': sampler,
+            'trigger': trigger,
+            'method': method,
+            'path': path,
+            'endpoint': endpoint,
+            'created_at': time.time()
+        }
+
+    def _before_request(self):
+        if request.endpoint in (None, 'static') or request.path.startswith('/admin/'):
+            return
+
+        trigger = self._trigger(request.headers, request.args)
+        if trigger is None:
+            return
+
+        sampler = StackSampler(self.interval)
+        sampler.track(threading.get_ident())
+        profile = self._start(trigger, request.method, request.path, request.endpoint, sampler)
+        g.request_profile = profile
+        _active_profile.set(profile)
+
+    def _after_request(self, response):
+        profile = g.pop('request_profile', None)
+        if profile is None:
+            return response
+
+        profile['status'] = response.status_code
+        response.headers['X-Profile-Id'] = profile['id']
+        # Stop when the body has been sent, so streamed responses are covered
+        response.call_on_close(lambda: self._finish(profile))
+        return response
+
+    def _teardown_request(self, exc):
+        # after_request hands the profile to the response; if it never ran
+        # (e.g. a propagated exception) stop the sampler and drop the samples
+        profile = g.pop('request_profile', None)
+        if profile is not None:
+            profile['sampler'].stop()
+            self.logger.info(f"Discarded profile {profile['id']} of {profile['method']} {profile['path']}: no response")
+
+        # The server thread's context outlives the request; don't leak the profile
+        _active_profile.set(None)
+
+    @web.middleware
+    async def _aiohttp_middleware(self, request, handler):
+        if request.path.startswith('/admin/'):
+            return await handler(request)
+        trigger = self._trigger(request.headers, request.query)
+        if trigger is None:
+            return await handler(request)
+
+        loop = asyncio.get_running_loop()
+        track_tasks(loop)
+        handler_task = asyncio.current_task()
+        sampler = StackSampler(self.interval, loop=loop,
+                               owns_task=lambda task: _task_profiles.get(task) is profile)
+        sampler.track(threading.get_ident())
+        route = request.match_info.route
+        profile = self._start(trigger, request.method, request.path, getattr(route.handler, '__name__', None), sampler)
+        _task_profiles[handler_task] = profile
+        request['profile'] = profile
+        token = _active_profile.set(profile)
+        try:
+            response = await handler(request)
+        except BaseException:
+            sampler.stop()
+            self.logger.info(f"Discarded profile {profile['id']} of {profile['method']} {profile['path']}: no response")
+            raise
+        finally:
+            _active_profile.reset(token)
+            _task_profiles.pop(handler_task, None)
+
+        # Handlers return once a streamed body has been written, so it is covered
+        profile['status'] = response.status
+        await asyncio.to_thread(self._finish, profile)
+        return response
+
+    async def _set_profile_header(self, request, response):
+        profile = request.get('profile')
+        if profile is not None:
+            response.headers['X-Profile-Id'] = profile['id']
+
+    def _finish(self, profile):
+        sampler = profile.pop('sampler')
+        sampler.stop()
+        profile['duration_ms'] = round(sampler.duration * 1000, 1)
+        profile['samples'] = sum(len(stacks) for stacks, _ in sampler.samples.values())
+
+        name = f"{profile['method']} {profile['path']} {profile['duration_ms']} ms"
+        try:
+            self._write(f"{profile['id']}.speedscope.json", sampler.to_speedscope(name))
+            self._write(f"{profile['id']}.meta.json", profile)
+            self._prune()
+            self.logger.info(f"Saved {profile['trigger']} profile {profile['id']} for {name}")
+        except Exception as e:
+            self.logger.error(f"Failed to save profile {profile['id']}: {str(e)}")
+
+    def _write(self, filename, data):
+        path = os.path.join(self.directory, filename)
+        tmp_path = os.path.join(self.directory, f'.{filename}.{secrets.token_hex(4)}.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+    def _prune(self):
+        """Keep only the newest max_files profiles"""
+        with self._prune_lock:
+            metas = sorted(name for name in os.listdir(self.directory) if name.endswith('.meta.json'))
+            for name in metas[:max(len(metas) - self.max_files, 0)]:
+                profile_id = name[:-len('.meta.json')]
+                for suffix in ('.meta.json', '.speedscope.json'):
+                    try:
+                        os.remove(os.path.join(self.directory, profile_id + suffix))
+                    except FileNotFoundError:
+                        pass
+
+    def list_profiles(self, limit=50):
+        """Metadata of the most recent profiles, newest first"""
+        metas = sorted((name for name in os.listdir(self.directory) if name.endswith('.meta.json')), reverse=True)
+        profiles = []
+        for name in metas[:limit]:
+            try:
+                with open(os.path.join(self.directory, name)) as f:
+                    profiles.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        return profiles
+
+    def profile_path(self, profile_id):
+        """Path of a saved speedscope file, or None"""
+        if not profile_id.replace('-', '').isalnum():
+            return None
+        path = os.path.join(self.directory, f'{profile_id}.speedscope.json')
+        return path if os.path.exists(path) else None
@@ -0,0 +1,84 @@
+import os
+import json
+import secrets
+import threading
+import time
+import logging
+from collections import OrderedDict
+
+from sqlite_connections import ThreadLocalConnections
+
+
+class ResultStore:
+    """
+    Server-side store for analysis results keyed by an opaque id.
+    Recent results live in an in-process LRU; with a SQLite path they are
+    also persisted so any worker can serve them.
+    """
+
+    SCHEMA = '''
+        CREATE TABLE IF NOT EXISTS results (
+            id TEXT PRIMARY KEY,
+            data TEXT NOT NULL,
+            created_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_results_created_at ON results(created_at);
+    '''
+
+    def __init__(self, path=None, max_entries=1000, ttl=7 * 86400):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl  # seconds a result stays retrievable
+        self.logger = logging.getLogger(__name__)
+        self._cache = OrderedDict()  # id -> (created_at, data)
+        self._lock = threading.Lock()
+        self._connections = None
+
+        if path:
+            self._connections = ThreadLocalConnections(path)
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._connections.get().executescript(self.SCHEMA)
+
+    def _remember(self, result_id, created_at, data):
+        with self._lock:
+            self._cache[result_id] = (created_at, data)
+            self._cache.move_to_end(result_id)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+    def put(self, data):
+        """Store a JSON-serialisable result and return its id"""
+        result_id = secrets.token_urlsafe(16)
+        created_at = time.time()
+
+        if self.path:
+            conn = self._connections.get()
+            with conn:
+                conn.execute(
+                    'INSERT INTO results (id, data, created_at) VALUES (?, ?, ?)',
+                    (result_id, json.dumps(data), created_at)
+                )
+                conn.execute('DELETE FROM results WHERE created_at < ?', (created_at - self.ttl,))
+
+        self._remember(result_id, created_at, data)
+        return result_id
+
+    def get(self, result_id):
+        """Return the stored result, or None if unknown or expired"""
+        now = time.time()
+        with self._lock:
+            entry = self._cache.get(result_id)
+            if entry is not None:
+                self._cache.move_to_end(result_id)
+
+        if entry is None and self.path:
+            row = self._connections.get().execute(
+                'SELECT created_at, data FROM results WHERE id = ?', (result_id,)
+            ).fetchone()
+            if row is not None:
+                entry = (row[0], json.loads(row[1]))
+                self._remember(result_id, *entry)
+
+        if entry is None or now - entry[0] > self.ttl:
+            return None
+        return entry[1]
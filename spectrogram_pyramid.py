@@ -0,0 +1,96 @@
+import io
+import numpy as np
+import librosa
+import matplotlib
+from PIL import Image
+
+# dB range mapped onto 0..255; quieter bins clip to 0
+DB_FLOOR = -80.0
+
+_palette = None
+
+
+def _magma_palette():
+    """256-entry RGB palette for paletted PNG tiles"""
+    global _palette
+    if _palette is None:
+        colors = matplotlib.colormaps['magma'](np.arange(256))[:, :3]
+        _palette = (colors * 255).astype(np.uint8).flatten().tolist()
+    return _palette
+
+
+def _quantize(magnitude, ref):
+    """Magnitude -> dB relative to ref -> uint8"""
+    db = 20.0 * np.log10(np.maximum(magnitude, 1e-10) / ref)
+    return ((np.clip(db, DB_FLOOR, 0.0) - DB_FLOOR) * (255.0 / -DB_FLOOR)).astype(np.uint8)
+
+
+def _decimate(level):
+    """Halve the time resolution, keeping the loudest value of each pair of frames"""
+    if level.shape[1] % 2:
+        level = np.concatenate([level, level[:, -1:]], axis=1)
+    return level.reshape(level.shape[0], -1, 2).max(axis=2)
+
+
+def build_spectrogram_pyramid(y, sr, n_fft=512, hop_length=256, tile_width=256, chunk_frames=4096):
+    """
+    Precompute a multi-resolution spectrogram for y, returning (data, meta).
+
+    The full-resolution STFT is computed chunk by chunk (equivalent to
+    librosa.stft with center=True) and quantized to uint8 dB. Coarser
+    levels halve the time resolution until one tile covers the whole
+    file. Level 0 is the coarsest; the last level is full resolution.
+    All levels are concatenated along time into one uint8 array, so once
+    saved with np.save a tile is a column slice of a memory-mapped file;
+    meta holds the layout.
+    """
+    height = n_fft // 2  # drop the Nyquist bin so tiles are n_fft/2 rows
+    ref = n_fft / 4.0  # peak magnitude of a full-scale sine under a Hann window
+    n_frames = 1 + len(y) // hop_length
+    y_padded = np.pad(y, n_fft // 2, mode='constant')
+
+    full = np.empty((height, n_frames), dtype=np.uint8)
+    for start in range(0, n_frames, chunk_frames):
+        stop = min(start + chunk_frames, n_frames)
+        segment = y_padded[start * hop_length:(stop - 1) * hop_length + n_fft]
+        magnitude = np.abs(librosa.stft(segment, n_fft=n_fft, hop_length=hop_length, center=False))
+        full[:, start:stop] = _quantize(magnitude[:height, :stop - start], ref)
+
+    levels = [full]
+    while levels[-1].shape[1] > tile_width:
+        levels.append(_decimate(levels[-1]))
+    levels.reverse()
+
+    widths = [level.shape[1] for level in levels]
+    meta = {
+        'levels': len(levels),
+        'widths': widths,
+        'offsets': [int(x) for x in np.cumsum([0] + widths[:-1])],
+        'tiles': [-(-w // tile_width) for w in widths],
+        'tile_width': tile_width,
+        'height': height,
+        'sample_rate': int(sr),
+        'frames_per_second': sr / hop_length,
+        'duration': float(len(y) / sr),
+        'max_frequency': sr / 2.0,
+    }
+
+    return np.concatenate(levels, axis=1), meta
+
+
+def render_tile(data_path, meta, level, tile):
+    """PNG bytes for one tile, low frequencies at the bottom"""
+    if not (0 <= level < meta['levels'] and 0 <= tile < meta['tiles'][level]):
+        raise IndexError('Tile out of range')
+
+    data = np.load(data_path, mmap_mode='r')
+    start = meta['offsets'][level] + tile * meta['tile_width']
+    stop = min(start + meta['tile_width'], meta['offsets'][level] + meta['widths'][level])
+
+    image = Image.fromarray(np.ascontiguousarray(data[::-1, start:stop]))
+    image = image.convert('P')
+    image.putpalette(_magma_palette())
+
+    buffer = io.BytesIO()
+    image.save(buffer, format='PNG', optimize=False)
+    return buffer.getvalue()
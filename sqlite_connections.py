@@ -0,0 +1,33 @@
+import os
+import sqlite3
+import threading
+
+
+class ThreadLocalConnections:
+    """
+    One SQLite connection per thread, opened on first use in WAL mode.
+    sqlite3 connections can't be shared between threads, and forked
+    workers must not reuse the parent's, so children start with none.
+    """
+
+    def __init__(self, path, row_factory=None, timeout=30):
+        self.path = path
+        self.row_factory = row_factory
+        self.timeout = timeout  # seconds to wait for another writer's lock
+        self._local = threading.local()
+        os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self):
+        self._local = threading.local()
+
+    def get(self):
+        """Return this thread's connection, opening it on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout)
+            if self.row_factory is not None:
+                conn.row_factory = self.row_factory
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
@@ -27,6 +27,12 @@ document.addEventListener('DOMContentLoaded', function() {
         // Show loading state
         setLoadingState(true);
         
+        // Stream results as each source responds when the browser supports it
+        if (window.EventSource) {
+            streamVerification(headline);
+            return;
+        }
+        
         try {
             const response = await fetch('/verify', {
                 method: 'POST',
@@ -52,6 +58,76 @@ document.addEventListener('DOMContentLoaded', function() {
         }
     });
     
+    function streamVerification(headline) {
+        const source = new EventSource('/verify_stream?headline=' + encodeURIComponent(headline));
+        const progressDiv = document.getElementById('news-progress');
+        let responded = 0;
+        let completed = false;
+        
+        // Partial result, rendered after every update
+        const partial = {
+            authenticity_score: 0,
+            verification_status: 'Checking sources...',
+            sources_found: [],
+            summary: {},
+            details: { total_sources_checked: 0, matching_sources: 0, verification_method: [] }
+        };
+        
+        function updateProgress(label) {
+            responded += 1;
+            if (progressDiv) {
+                progressDiv.textContent = `Sources responded: ${responded} (latest: ${label})`;
+                progressDiv.classList.remove('d-none');
+            }
+        }
+        
+        function handleMatches(e) {
+            const data = JSON.parse(e.data);
+            partial.sources_found.push(...data.matches);
+            if (!partial.details.verification_method.includes(data.method)) {
+                partial.details.verification_method.push(data.method);
+            }
+            updateProgress(data.source);
+            displayResults(partial, true);
+        }
+        
+        source.addEventListener('newsapi', handleMatches);
+        source.addEventListener('feed', handleMatches);
+        source.addEventListener('archive', handleMatches);
+        
+        source.addEventListener('fact_check', (e) => {
+            const data = JSON.parse(e.data);
+            updateProgress(data.source);
+        });
+        
+        source.addEventListener('score', (e) => {
+            const data = JSON.parse(e.data);
+            partial.authenticity_score = data.authenticity_score;
+            partial.verification_status = data.verification_status;
+            partial.details.total_sources_checked = data.total_sources_checked;
+            partial.details.matching_sources = data.matching_sources;
+            displayResults(partial, true);
+        });
+        
+        source.addEventListener('complete', (e) => {
+            completed = true;
+            source.close();
+            if (progressDiv) {
+                progressDiv.classList.add('d-none');
+            }
+            displayResults(JSON.parse(e.data));
+            setLoadingState(false);
+        });
+        
+        source.onerror = () => {
+            source.close();
+            if (!completed) {
+                showAlert('Network error. Please try again.', 'danger');
+                setLoadingState(false);
+            }
+        };
+    }
+    
     function setLoadingState(loading) {
         if (loading) {
             verifyBtn.disabled = true;
@@ -64,7 +140,7 @@ document.addEventListener('DOMContentLoaded', function() {
         }
     }
     
-    function displayResults(result) {
+    function displayResults(result, provisional = false) {
         const scoreClass = getScoreClass(result.authenticity_score);
         
         resultsDiv.innerHTML = `
@@ -72,10 +148,11 @@ document.addEventListener('DOMContentLoaded', function() {
                 <div class="card-body">
                     <div class="row">
                         <div class="col-md-4 text-center">
-                            <div class="authenticity-score ${scoreClass} pulse">
+                            <div class="authenticity-score ${scoreClass} ${provisional ? '' : 'pulse'}">
                                 ${result.authenticity_score}%
                             </div>
                             <h5 class="mt-2">${result.verification_status}</h5>
+                            ${provisional ? '<small class="text-muted">Provisional score</small>' : ''}
                         </div>
                         <div class="col-md-8">
                             <h6>Verification Details:</h6>
@@ -135,8 +212,11 @@ document.addEventListener('DOMContentLoaded', function() {
             </div>
         `;
         
+        const firstRender = resultsDiv.classList.contains('d-none');
         resultsDiv.classList.remove('d-none');
-        resultsDiv.scrollIntoView({ behavior: 'smooth' });
+        if (firstRender || !provisional) {
+            resultsDiv.scrollIntoView({ behavior: 'smooth' });
+        }
     }
     
     function getScoreClass(score) {
@@ -186,8 +266,8 @@ document.addEventListener('DOMContentLoaded', function() {
                 });
                 
                 if (response.ok) {
-                    // Redirect to results page
-                    window.location.href = '/audio_result';
+                    // Redirect to the stored results page
+                    window.location.href = response.redirected ? response.url : '/audio_result';
                 } else {
                     const error = await response.json();
                     showAlert(error.error || 'Audio analysis failed', 'danger');
@@ -0,0 +1,177 @@
+// Zoomable spectrogram for the audio results page.
+// Loads only the pyramid tiles that cover the visible time range.
+
+document.addEventListener('DOMContentLoaded', function() {
+    const viewer = document.getElementById('spectrogram-viewer');
+    if (!viewer) {
+        return;
+    }
+
+    const metaUrl = viewer.dataset.metaUrl;
+    const canvas = viewer.querySelector('canvas');
+    const ctx = canvas.getContext('2d');
+    const card = viewer.parentElement;
+    const rangeLabel = card.querySelector('.spectrogram-range');
+
+    const MAX_CACHED_TILES = 256;
+    const tiles = new Map();  // "level/tile" -> Image, oldest first
+
+    let meta = null;
+    let start = 0;  // seconds
+    let span = 0;  // seconds visible
+    let drawPending = false;
+
+    fetch(metaUrl)
+        .then(response => response.ok ? response.json() : Promise.reject(response.status))
+        .then(data => {
+            meta = data;
+            span = meta.duration;
+            resizeCanvas();
+            scheduleDraw();
+        })
+        .catch(error => {
+            console.error('Spectrogram unavailable:', error);
+            card.style.display = 'none';
+        });
+
+    function resizeCanvas() {
+        canvas.width = Math.round(canvas.clientWidth * (window.devicePixelRatio || 1));
+        canvas.height = meta.height;
+    }
+
+    function columnsPerSecond(level) {
+        return meta.widths[level] / meta.widths[meta.levels - 1] * meta.frames_per_second;
+    }
+
+    function levelForView() {
+        // Coarsest level with at least one column per canvas pixel
+        for (let level = 0; level < meta.levels; level++) {
+            if (span * columnsPerSecond(level) >= canvas.width) {
+                return level;
+            }
+        }
+        return meta.levels - 1;
+    }
+
+    function getTile(level, tile, load) {
+        const key = level + '/' + tile;
+        let image = tiles.get(key);
+        if (image) {
+            // Refresh its position in the LRU order
+            tiles.delete(key);
+            tiles.set(key, image);
+            return image;
+        }
+        if (!load) {
+            return null;
+        }
+
+        image = new Image();
+        image.onload = scheduleDraw;
+        image.src = metaUrl + '/' + level + '/' + tile;
+        tiles.set(key, image);
+        if (tiles.size > MAX_CACHED_TILES) {
+            tiles.delete(tiles.keys().next().value);
+        }
+        return image;
+    }
+
+    function drawLevel(level, load) {
+        const cps = columnsPerSecond(level);
+        const tileWidth = meta.tile_width;
+        const first = Math.max(0, Math.floor(start * cps / tileWidth));
+        const last = Math.min(meta.tiles[level] - 1, Math.floor((start + span) * cps / tileWidth));
+        const pixelsPerSecond = canvas.width / span;
+
+        for (let tile = first; tile <= last; tile++) {
+            const image = getTile(level, tile, load);
+            if (!image || !image.complete || !image.naturalWidth) {
+                continue;
+            }
+            const columns = Math.min(tileWidth, meta.widths[level] - tile * tileWidth);
+            const x = (tile * tileWidth / cps - start) * pixelsPerSecond;
+            const width = columns / cps * pixelsPerSecond;
+            ctx.drawImage(image, x, 0, width, canvas.height);
+        }
+    }
+
+    function draw() {
+        drawPending = false;
+        ctx.imageSmoothingEnabled = false;
+        ctx.fillStyle = '#000004';
+        ctx.fillRect(0, 0, canvas.width, canvas.height);
+
+        // Coarser tiles already loaded stand in until the detailed ones arrive
+        const level = levelForView();
+        for (let coarser = 0; coarser < level; coarser++) {
+            drawLevel(coarser, false);
+        }
+        drawLevel(level, true);
+
+        rangeLabel.textContent = start.toFixed(2) + 's – ' + (start + span).toFixed(2) + 's';
+    }
+
+    function scheduleDraw() {
+        if (meta && !drawPending) {
+            drawPending = true;
+            requestAnimationFrame(draw);
+        }
+    }
+
+    function setView(newStart, newSpan) {
+        // Zoom in no further than one spectrogram frame per canvas pixel
+        const minSpan = Math.min(meta.duration, canvas.width / meta.frames_per_second);
+        span = Math.min(meta.duration, Math.max(minSpan, newSpan));
+        start = Math.min(meta.duration - span, Math.max(0, newStart));
+        scheduleDraw();
+    }
+
+    function zoom(factor, anchorFraction) {
+        const anchor = start + span * anchorFraction;
+        const newSpan = span / factor;
+        setView(anchor - newSpan * anchorFraction, newSpan);
+    }
+
+    canvas.addEventListener('wheel', function(e) {
+        if (!meta) {
+            return;
+        }
+        e.preventDefault();
+        const rect = canvas.getBoundingClientRect();
+        zoom(e.deltaY < 0 ? 1.25 : 0.8, (e.clientX - rect.left) / rect.width);
+    }, { passive: false });
+
+    let dragX = null;
+    canvas.addEventListener('pointerdown', function(e) {
+        dragX = e.clientX;
+        canvas.setPointerCapture(e.pointerId);
+        canvas.style.cursor = 'grabbing';
+    });
+    canvas.addEventListener('pointermove', function(e) {
+        if (dragX === null || !meta) {
+            return;
+        }
+        const secondsPerPixel = span / canvas.getBoundingClientRect().width;
+        setView(start - (e.clientX - dragX) * secondsPerPixel, span);
+        dragX = e.clientX;
+    });
+    canvas.addEventListener('pointerup', function() {
+        dragX = null;
+        canvas.style.cursor = 'grab';
+    });
+
+    card.querySelectorAll('[data-zoom]').forEach(button => {
+        button.addEventListener('click', function() {
+            if (meta) {
+                zoom(button.dataset.zoom === 'in' ? 2 : 0.5, 0.5);
+            }
+        });
+    });
+
+    window.addEventListener('resize', function() {
+        if (meta) {
+            resizeCanvas();
+            setView(start, span);
+        }
+    });
+});
@@ -0,0 +1,67 @@
+import time
+
+import pytest
+
+from article_archive import ArticleArchive
+
+
+def article(url, title, description=''):
+    return {'url': url, 'source': 'Test', 'title': title, 'description': description, 'published_at': ''}
+
+
+@pytest.fixture
+def archive(tmp_path):
+    return ArticleArchive(str(tmp_path / 'articles.db'), retention_days=30, max_term_docs=3)
+
+
+def test_rare_terms_are_ranked(archive):
+    archive.add_articles([article(f'https://example.com/{i}', f'Election results day {i}') for i in range(10)])
+    archive.add_articles([article('https://example.com/flood', 'Flood waters rise in Assam')])
+
+    results = archive.search('Assam election flood')
+
+    # "election" is in too many articles to search by; the rare words find the flood story
+    assert [r['url'] for r in results] == ['https://example.com/flood']
+
+
+def test_common_terms_fall_back_to_newest(archive):
+    archive.add_articles([article(f'https://example.com/{i}', f'Election results day {i}') for i in range(10)])
+
+    results = archive.search('election results', limit=3)
+
+    assert [r['url'] for r in results] == [f'https://example.com/{i}' for i in (9, 8, 7)]
+
+
+def test_no_matching_terms(archive):
+    archive.add_articles([article('https://example.com/1', 'Election results')])
+
+    assert archive.search('cricket') == []
+    assert archive.search('a an') == []
+
+
+def test_operators_in_input_are_literal(archive):
+    archive.add_articles([article('https://example.com/1', 'Monsoon NEAR Kerala')])
+
+    assert len(archive.search('monsoon NEAR "kerala*')) == 1
+
+
+def test_articles_are_deduplicated_by_url(archive):
+    archive.add_articles([article('https://example.com/1', 'Cyclone makes landfall')])
+    archive.add_articles([article('https://example.com/1', 'Cyclone makes landfall'),
+                          article('https://example.com/2', 'Cyclone weakens')])
+
+    assert archive.count() == 2
+    assert len(archive.search('cyclone')) == 2
+
+
+def test_compact_removes_expired_articles(archive):
+    archive.add_articles([article('https://example.com/old', 'Earthquake hits region'),
+                          article('https://example.com/new', 'Earthquake aftershocks')])
+    conn = archive._connections.get()
+    with conn:
+        conn.execute('UPDATE articles SET seen_at = ? WHERE url = ?',
+                     (time.time() - 31 * 86400, 'https://example.com/old'))
+
+    assert archive.compact() == 1
+    assert archive.count() == 1
+    assert [r['url'] for r in archive.search('earthquake')] == ['https://example.com/new']
@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from audio_features import AudioAnalysis, DEFAULT_FEATURES, FEATURES, parse_feature_selection
+
+
+def test_default_and_all_selections():
+    assert parse_feature_selection(None) == DEFAULT_FEATURES
+    assert parse_feature_selection(' ALL ') == FEATURES
+    assert parse_feature_selection('') == []
+    assert parse_feature_selection('none') == []
+
+
+def test_named_features_are_deduplicated_in_order():
+    assert parse_feature_selection('tempo, duration,tempo,,') == ['tempo', 'duration']
+
+
+def test_unknown_features_are_rejected():
+    with pytest.raises(ValueError, match='Unknown features: pitch'):
+        parse_feature_selection('duration,pitch')
+
+
+def test_only_requested_features_are_computed():
+    sr = 22050
+    y = 0.1 * np.sin(2 * np.pi * 440 * np.arange(sr) / sr).astype(np.float32)
+    analysis = AudioAnalysis(y=y, sr=sr)
+
+    assert analysis.plan(['spectral_centroid']) == ['speech_intervals', 'y', 'stft_magnitude', 'spectral_centroid']
+    assert set(analysis.compute(['duration', 'sample_rate'])) == {'duration', 'sample_rate'}
+    # Intermediates are computed once and shared by later requests
+    analysis.compute(['spectral_centroid'])
+    assert analysis.plan(['spectral_bandwidth']) == ['spectral_bandwidth']
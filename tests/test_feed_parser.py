@@ -0,0 +1,113 @@
+import re
+import xml.etree.ElementTree as ET
+
+import feedparser
+import pytest
+
+from feed_parser import parse_feed, parse_feed_content
+
+RSS = b'''<?xml version="1.0" encoding="utf-8"?>
+<rss version="2.0" xmlns:media="http://search.yahoo.com/mrss/" xmlns:dc="http://purl.org/dc/elements/1.1/">
+  <channel>
+    <title>Example News</title>
+    <link>https://news.example.com/</link>
+    <item>
+      <title>Floods hit Assam &amp; Meghalaya</title>
+      <link>https://news.example.com/floods</link>
+      <pubDate>Mon, 01 Jul 2024 10:00:00 GMT</pubDate>
+      <description>&lt;p&gt;Heavy rain &lt;b&gt;continues&lt;/b&gt;.&lt;/p&gt;</description>
+      <media:title>Photo caption</media:title>
+      <media:content url="https://news.example.com/floods.jpg" medium="image"/>
+    </item>
+    <item>
+      <media:title>Media title only</media:title>
+      <title>Markets close higher</title>
+      <link>https://news.example.com/markets</link>
+      <dc:date>2024-07-01T12:00:00Z</dc:date>
+    </item>
+  </channel>
+</rss>'''
+
+ATOM = b'''<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <title type="html">World &lt;em&gt;Desk&lt;/em&gt;</title>
+  <entry>
+    <title type="html">Summit &lt;b&gt;ends&lt;/b&gt; in Delhi</title>
+    <link rel="enclosure" href="https://world.example.com/summit.mp3"/>
+    <link rel="alternate" href="https://world.example.com/summit"/>
+    <updated>2024-07-02T08:00:00Z</updated>
+    <summary type="html">&lt;p&gt;Leaders agree on a statement.&lt;/p&gt;</summary>
+  </entry>
+</feed>'''
+
+
+def fields(entry):
+    return {key: entry.get(key, '') for key in ('title', 'link', 'published', 'summary')}
+
+
+def text(value):
+    """feedparser keeps (sanitized) markup in HTML text constructs; parse_feed keeps the text only"""
+    return re.sub(r'<[^>]+>', '', value or '').strip()
+
+
+@pytest.mark.parametrize('content', [RSS, ATOM], ids=['rss', 'atom'])
+def test_matches_feedparser(content):
+    ours = parse_feed(content)
+    reference = feedparser.parse(content)
+
+    assert reference.version.startswith(ours.version)
+    assert ours.feed.get('title') == text(reference.feed.get('title'))
+    assert [e.title for e in ours.entries] == [text(e.title) for e in reference.entries]
+    assert [e.link for e in ours.entries] == [e.link for e in reference.entries]
+    assert [e.summary for e in ours.entries] == [text(e.get('summary')) for e in reference.entries]
+
+
+def test_rss_entry_fields():
+    feed = parse_feed(RSS)
+
+    assert feed.version == 'rss'
+    assert fields(feed.entries[0]) == {
+        'title': 'Floods hit Assam & Meghalaya',
+        'link': 'https://news.example.com/floods',
+        'published': 'Mon, 01 Jul 2024 10:00:00 GMT',
+        'summary': 'Heavy rain continues.',
+    }
+    # dc:date stands in for pubDate
+    assert feed.entries[1].published == '2024-07-01T12:00:00Z'
+
+
+def test_media_elements_are_ignored():
+    feed = parse_feed(RSS)
+
+    assert [e.title for e in feed.entries] == ['Floods hit Assam & Meghalaya', 'Markets close higher']
+    assert feed.entries[0].link == 'https://news.example.com/floods'
+
+
+def test_atom_html_text_and_alternate_link():
+    feed = parse_feed(ATOM)
+
+    assert feed.version == 'atom'
+    assert feed.feed.get('title') == 'World Desk'
+    assert fields(feed.entries[0]) == {
+        'title': 'Summit ends in Delhi',
+        'link': 'https://world.example.com/summit',
+        'published': '2024-07-02T08:00:00Z',
+        'summary': 'Leaders agree on a statement.',
+    }
+
+
+def test_non_feed_documents_have_no_version():
+    feed = parse_feed(b'<html><head><title>Not a feed</title></head><body></body></html>')
+
+    assert feed.version == ''
+    assert feed.entries == []
+
+
+def test_malformed_xml_falls_back_to_feedparser():
+    content = RSS.replace(b'</channel>', b'')
+
+    with pytest.raises(ET.ParseError):
+        parse_feed(content)
+    feed = parse_feed_content(content, 'https://news.example.com/rss')
+    assert feed.bozo
+    assert [e.title for e in feed.entries] == ['Floods hit Assam & Meghalaya', 'Markets close higher']
@@ -0,0 +1,106 @@
+import pytest
+
+import feed_scheduler
+from feed_parser import FeedEntry, ParsedFeed
+from feed_scheduler import FeedScheduler, CLOSED, OPEN, HALF_OPEN
+
+URL = 'https://news.example.com/rss'
+FEED = ParsedFeed('Example', [FeedEntry('Headline', 'https://news.example.com/1')], 'rss')
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(feed_scheduler.time, 'time', clock)
+    return clock
+
+
+@pytest.fixture
+def scheduler(clock):
+    return FeedScheduler(failure_threshold=2, cooldown=60, max_cooldown=200, probe_timeout=30)
+
+
+def state(scheduler, url=URL):
+    return next(s['state'] for s in scheduler.stats() if s['url'] == url)
+
+
+def test_circuit_opens_after_consecutive_failures(scheduler):
+    scheduler.record_failure(URL, 0.1, 'timeout')
+    assert state(scheduler) == CLOSED
+    assert scheduler.plan([URL]) == [(URL, None)]
+
+    scheduler.record_failure(URL, 0.1, 'timeout')
+    assert state(scheduler) == OPEN
+    assert scheduler.plan([URL]) == []
+
+
+def test_success_resets_the_failure_count(scheduler):
+    scheduler.record_failure(URL, 0.1, 'timeout')
+    scheduler.record_success(URL, 0.1, FEED)
+    scheduler.record_failure(URL, 0.1, 'timeout')
+
+    assert state(scheduler) == CLOSED
+
+
+def test_half_open_probe_closes_the_circuit(scheduler, clock):
+    scheduler.record_failure(URL, 0.1, 'timeout')
+    scheduler.record_failure(URL, 0.1, 'timeout')
+
+    clock.now += 61
+    assert scheduler.plan([URL]) == [(URL, None)]
+    assert state(scheduler) == HALF_OPEN
+    # Only one probe at a time
+    assert scheduler.plan([URL]) == []
+
+    scheduler.record_success(URL, 0.1, FEED)
+    assert state(scheduler) == CLOSED
+    assert scheduler.plan([URL]) == [(URL, FEED)]
+
+
+def test_failed_probe_reopens_with_a_longer_cooldown(scheduler, clock):
+    scheduler.record_failure(URL, 0.1, 'timeout')
+    scheduler.record_failure(URL, 0.1, 'timeout')
+    clock.now += 61
+    scheduler.plan([URL])
+
+    scheduler.record_failure(URL, 0.1, 'timeout')
+    assert state(scheduler) == OPEN
+
+    clock.now += 61
+    assert scheduler.plan([URL]) == []
+    clock.now += 60
+    assert scheduler.plan([URL]) == [(URL, None)]
+
+
+def test_lost_probe_is_retried(scheduler, clock):
+    scheduler.record_failure(URL, 0.1, 'timeout')
+    scheduler.record_failure(URL, 0.1, 'timeout')
+    clock.now += 61
+    scheduler.plan([URL])
+
+    clock.now += 31
+    assert scheduler.plan([URL]) == [(URL, None)]
+
+
+def test_cached_feed_is_reused_until_its_refresh_interval(scheduler, clock):
+    scheduler.record_success(URL, 0.1, FEED)
+    assert scheduler.plan([URL]) == [(URL, FEED)]
+
+    clock.now += scheduler.min_refresh + 1
+    assert scheduler.plan([URL]) == [(URL, None)]
+
+
+def test_higher_yield_sources_come_first(scheduler):
+    other = 'https://other.example.com/rss'
+    scheduler.record_matches(URL, 0)
+    scheduler.record_matches(other, 3)
+
+    assert [url for url, _ in scheduler.plan([URL, other])] == [other, URL]
@@ -0,0 +1,62 @@
+import pytest
+
+from gazetteer import Gazetteer, get_gazetteer
+
+
+@pytest.fixture
+def gazetteer():
+    gazetteer = Gazetteer()
+    for phrase, kind in [('new delhi', 'place_india'), ('delhi', 'place_india'),
+                         ('new york', 'place_international'), ('new york city', 'place_international'),
+                         ('york', 'place_international'), ('the', 'stop'), ('in', 'stop'),
+                         ('fire', 'priority'), ('march', 'month')]:
+        gazetteer.add(phrase, kind)
+    gazetteer.build()
+    return gazetteer
+
+
+def names(result):
+    return [place['name'] for place in result.places]
+
+
+def test_longest_match_reports_every_overlapping_entry(gazetteer):
+    result = gazetteer.scan('Fire in New York City')
+
+    # Entries are reported where they end; suffixes of a longer phrase are kept too
+    assert names(result) == ['new york', 'york', 'new york city']
+    assert result.places[-1]['text'] == 'New York City'
+
+
+def test_failure_links_recover_partial_matches(gazetteer):
+    # "new" starts "new york" but is followed by "delhi": the scan falls back to "delhi"
+    assert names(gazetteer.scan('Smog over New Delhi')) == ['new delhi', 'delhi']
+    assert names(gazetteer.scan('New New Delhi')) == ['new delhi', 'delhi']
+
+
+def test_matches_respect_word_boundaries(gazetteer):
+    result = gazetteer.scan('Delhiites and Yorkshire firefighters')
+
+    assert result.places == []
+    assert not any(result.priority)
+
+
+def test_stop_and_priority_flags(gazetteer):
+    result = gazetteer.scan('The fire in Delhi')
+
+    assert result.tokens == ['the', 'fire', 'in', 'delhi']
+    assert result.stop == [True, False, True, False]
+    assert result.priority == [False, True, False, True]
+
+
+def test_dates_persons_and_locations(gazetteer):
+    result = gazetteer.scan('Rahul Sharma said on March 5, 2024 that Park Street is closed')
+
+    assert result.dates == ['March 5, 2024']
+    assert result.persons == ['Rahul Sharma', 'Park Street']
+    assert result.locations == ['Park Street']
+
+
+def test_bundled_data_loads():
+    result = get_gazetteer().scan('Heavy rain in Andhra Pradesh')
+
+    assert {'name': 'andhra pradesh', 'kind': 'place_india', 'text': 'Andhra Pradesh'} in result.places
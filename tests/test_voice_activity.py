@@ -0,0 +1,58 @@
+import numpy as np
+
+from voice_activity import detect_speech, keep_speech, speech_duration
+
+SR = 16000
+
+
+def tone(seconds, amplitude=0.5):
+    t = np.arange(int(seconds * SR)) / SR
+    return (amplitude * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+
+def silence(seconds, noise=0.0):
+    rng = np.random.default_rng(0)
+    return (noise * rng.standard_normal(int(seconds * SR))).astype(np.float32)
+
+
+def test_speech_between_pauses_is_found():
+    y = np.concatenate([silence(1), tone(1), silence(1), tone(1), silence(1)])
+
+    intervals = detect_speech(y, SR, padding=0)
+
+    assert len(intervals) == 2
+    assert np.allclose(intervals / SR, [[1, 2], [3, 4]], atol=0.1)
+    assert abs(speech_duration(intervals, SR) - 2) < 0.4
+    assert len(keep_speech(y, intervals)) == np.sum(intervals[:, 1] - intervals[:, 0])
+
+
+def test_short_gaps_are_bridged_and_regions_padded():
+    y = np.concatenate([silence(1), tone(0.5), silence(0.1), tone(0.5), silence(1)])
+
+    intervals = detect_speech(y, SR, padding=0.1)
+
+    assert len(intervals) == 1
+    assert intervals[0][0] / SR < 0.95 and intervals[0][1] / SR > 2.15
+
+
+def test_background_noise_is_not_speech():
+    y = np.concatenate([silence(1, noise=0.01), tone(1), silence(1, noise=0.01)])
+
+    intervals = detect_speech(y, SR, padding=0)
+
+    assert len(intervals) == 1
+    assert np.allclose(intervals[0] / SR, [1, 2], atol=0.1)
+
+
+def test_continuous_audio_is_kept_whole():
+    y = tone(2)
+
+    assert detect_speech(y, SR).tolist() == [[0, len(y)]]
+
+
+def test_silence_and_empty_input():
+    for y in (silence(1), np.zeros(0, dtype=np.float32)):
+        intervals = detect_speech(y, SR)
+        assert intervals.shape == (0, 2)
+        assert speech_duration(intervals, SR) == 0.0
+        assert keep_speech(y, intervals) is y
@@ -4,6 +4,7 @@ import requests
 from datetime import datetime
 import hashlib
 from urllib.parse import urlparse
+from gazetteer import get_gazetteer
 
 class NewsUtils:
     @staticmethod
@@ -20,30 +21,22 @@ class NewsUtils:
     @staticmethod
     def extract_entities(text):
         """Extract named entities from text (simplified version)"""
-        # This is a simplified entity extraction
+        # A single gazetteer pass finds names, places and dates
         # In production, you might want to use spaCy or NLTK
+        scan = get_gazetteer().scan(text)
+        
+        locations = list(scan.locations)
+        for place in scan.places:
+            if place['text'] not in locations:
+                locations.append(place['text'])
         
         entities = {
-            'persons': [],
+            'persons': scan.persons,
             'organizations': [],
-            'locations': [],
-            'dates': []
+            'locations': locations,
+            'dates': scan.dates
         }
         
-        # Extract potential person names (capitalized words)
-        person_pattern = r'\b[A-Z][a-z]+\s+[A-Z][a-z]+\b'
-        entities['persons'] = re.findall(person_pattern, text)
-        
-        # Extract potential locations
-        location_keywords = ['City', 'State', 'Country', 'Street', 'Avenue', 'Road']
-        for keyword in location_keywords:
-            matches = re.findall(rf'\b\w+\s+{keyword}\b', text, re.IGNORECASE)
-            entities['locations'].extend(matches)
-        
-        # Extract dates
-        date_pattern = r'\b(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},?\s+\d{4}\b'
-        entities['dates'] = re.findall(date_pattern, text, re.IGNORECASE)
-        
         return entities
     
     @staticmethod
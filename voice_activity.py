@@ -0,0 +1,71 @@
+import numpy as np
+import librosa
+
+FRAME_LENGTH = 2048
+HOP_LENGTH = 512
+
+
+def detect_speech(y, sr, top_db=40.0, noise_margin_db=10.0, max_threshold_db=-25.0,
+                  min_silence=0.3, min_speech=0.1, padding=0.1, min_rms=1e-4):
+    """
+    Energy-based voice activity detection. Returns an (n, 2) array of
+    [start, end) sample intervals containing speech.
+
+    A frame is voiced when its RMS level (dB relative to the loudest frame)
+    is above both the peak-relative floor (-top_db) and the estimated noise
+    floor (10th percentile level) plus noise_margin_db. The threshold is
+    capped at max_threshold_db so recordings without pauses are kept whole,
+    and frames below min_rms (digital silence) are never voiced.
+    Gaps shorter than min_silence are bridged, regions shorter than
+    min_speech dropped, and each region padded on both sides.
+    """
+    if len(y) == 0:
+        return np.empty((0, 2), dtype=np.int64)
+
+    rms = librosa.feature.rms(y=y, frame_length=FRAME_LENGTH, hop_length=HOP_LENGTH)[0]
+    db = librosa.amplitude_to_db(rms, ref=np.max)
+    threshold = min(max(-top_db, np.percentile(db, 10) + noise_margin_db), max_threshold_db)
+    voiced = (db > threshold) & (rms >= min_rms)
+
+    # Run boundaries as frame indices: starts[i] <= frame < ends[i]
+    edges = np.flatnonzero(np.diff(np.concatenate([[False], voiced, [False]]).astype(np.int8)))
+    starts, ends = edges[::2], edges[1::2]
+    if len(starts) == 0:
+        return np.empty((0, 2), dtype=np.int64)
+
+    frames_per_second = sr / HOP_LENGTH
+    keep = np.concatenate([[True], starts[1:] - ends[:-1] >= min_silence * frames_per_second])
+    starts, ends = starts[keep], np.concatenate([ends[np.flatnonzero(keep)[1:] - 1], ends[-1:]])
+
+    long_enough = ends - starts >= min_speech * frames_per_second
+    starts, ends = starts[long_enough], ends[long_enough]
+
+    pad = int(padding * sr)
+    intervals = np.column_stack([
+        np.maximum(starts * HOP_LENGTH - pad, 0),
+        np.minimum(ends * HOP_LENGTH + pad, len(y))
+    ])
+    return _merge_overlapping(intervals)
+
+
+def _merge_overlapping(intervals):
+    if len(intervals) < 2:
+        return intervals
+    merged = [list(intervals[0])]
+    for start, end in intervals[1:]:
+        if start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return np.array(merged, dtype=np.int64)
+
+
+def keep_speech(y, intervals):
+    """Concatenate the speech intervals of y; y itself if no speech was found"""
+    if len(intervals) == 0:
+        return y
+    return np.concatenate([y[start:end] for start, end in intervals])
+
+
+def speech_duration(intervals, sr):
+    return float(np.sum(intervals[:, 1] - intervals[:, 0]) / sr) if len(intervals) else 0.0
@@ -0,0 +1,108 @@
+import asyncio
+import functools
+import threading
+import logging
+from flask import jsonify
+
+logger = logging.getLogger(__name__)
+
+
+class RoutePool:
+    """Bounded number of in-flight requests for a group of routes"""
+
+    def __init__(self, name, size, queue_timeout):
+        self.name = name
+        self.size = size
+        self.queue_timeout = queue_timeout  # seconds to wait for a free slot
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.rejected = 0
+
+    def acquire(self):
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            with self._lock:
+                self.rejected += 1
+            return False
+        with self._lock:
+            self.in_flight += 1
+        return True
+
+    def release(self):
+        with self._lock:
+            self.in_flight -= 1
+        self._slots.release()
+
+    def stats(self):
+        return {'size': self.size, 'in_flight': self.in_flight, 'rejected': self.rejected}
+
+    def busy_response(self):
+        logger.warning(f"{self.name} pool full ({self.size} in flight), rejecting request")
+        response = jsonify({'error': 'Server busy, please retry shortly', 'status': 'error'})
+        response.status_code = 503
+        response.headers['Retry-After'] = str(max(1, int(self.queue_timeout)))
+        return response
+
+
+class AsyncRoutePool:
+    """RoutePool for coroutines that share one event loop (see news_service)"""
+
+    def __init__(self, name, size, queue_timeout):
+        self.name = name
+        self.size = size
+        self.queue_timeout = queue_timeout  # seconds to wait for a free slot
+        self._slots = asyncio.BoundedSemaphore(size)
+        self.in_flight = 0
+        self.rejected = 0
+
+    async def acquire(self):
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            return False
+        self.in_flight += 1
+        return True
+
+    def release(self):
+        self.in_flight -= 1
+        self._slots.release()
+
+    def stats(self):
+        return {'size': self.size, 'in_flight': self.in_flight, 'rejected': self.rejected}
+
+def limit_concurrency(pool):
+    """Run a view inside a pool slot; streamed responses hold the slot until they close"""
+    def decorator(view):
+        def finish(response):
+            if getattr(response, 'is_streamed', False):
+                response.call_on_close(pool.release)
+            else:
+                pool.release()
+            return response
+
+        if asyncio.iscoroutinefunction(view):
+            @functools.wraps(view)
+            async def async_wrapper(*args, **kwargs):
+                if not pool.acquire():
+                    return pool.busy_response()
+                try:
+                    response = await view(*args, **kwargs)
+                except BaseException:
+                    pool.release()
+                    raise
+                return finish(response)
+            return async_wrapper
+
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            if not pool.acquire():
+                return pool.busy_response()
+            try:
+                response = view(*args, **kwargs)
+            except BaseException:
+                pool.release()
+                raise
+            return finish(response)
+        return wrapper
+    return decorator
@@ -0,0 +1,51 @@
+"""
+Production entry point.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Importing this module loads the Flask app, the MLP model and the heavy
+audio/plotting libraries, and warms librosa's numba-compiled kernels.
+With preload_app this happens once in the gunicorn master, so workers
+share the loaded pages copy-on-write instead of each loading their own.
+"""
+import logging
+import numpy as np
+import librosa
+import librosa.beat
+import librosa.display
+import librosa.feature
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+from app import app
+from audio_features import AudioAnalysis, FEATURES
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+
+def warm_up():
+    """Run each audio feature once on a short synthetic tone so JIT compilation happens before fork"""
+    sr = 22050
+    t = np.arange(sr * 2) / sr
+    y = (0.5 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+    librosa.feature.mfcc(y=y, sr=sr, n_mfcc=13)
+    AudioAnalysis(y=y, sr=sr).compute(FEATURES)
+    librosa.amplitude_to_db(np.abs(librosa.stft(y)), ref=np.max)
+
+    plt.figure()
+    plt.close('all')
+
+
+if Config.PRELOAD_WARMUP:
+    try:
+        warm_up()
+        logger.info("Audio pipeline warmed up")
+    except Exception as e:
+        logger.warning(f"Audio warm-up failed: {str(e)}")
+
+
+if __name__ == "__main__":
+    app.run()